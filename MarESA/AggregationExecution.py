@@ -14,6 +14,11 @@
 # Change the names of the new mar-ESA extract file and then let all
 # the scripts run. This script runs all the rest of the scripts
 
+# Nothing is run when this script is imported (e.g. by the worker
+# processes, which import it to find the settings below) - the input
+# data and the aggregation scripts are only loaded within
+# run_aggregations()
+
 
 ########################################################################
 #
@@ -27,15 +32,16 @@ import sys
 import time
 from pathlib import Path
 
-# Test the run time of the function
-start = time.process_time()
+# Add the aggregation engine to the path - the folder of each aggregation script is added from the registry of
+# aggregations (see AggregationRegistry.py) when the aggregations are run
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Scripts', 'AggregationEngine'))
+from AggregationRegistry import add_script_paths, aggregation_task, validate_aggregations
 
 # Set the overall directory
-os.chdir('C://Users//Ollie.Grint//Documents//marine-sensitivity-aggregations')
+working_directory = 'C://Users//Ollie.Grint//Documents//marine-sensitivity-aggregations'
 
 # set the output file
 output_file= '20240206v2/'
-Path("./MarESA/Output/"+output_file).mkdir(parents=True, exist_ok=True)
 
 ########################################################################
 #
@@ -74,173 +80,267 @@ Scot_PMF = 'Scottish_Offshore_PMF_2022-04-29.csv'
 offshore_res_file = 'OffshoreResAgg_20220316_Bioreg20220310_marESA20220310.csv'
 offshore_resil_file = 'OffshoreResilAgg_20220316_Bioreg20220310_marESA20220310.csv'
 
-# This part is for adding directory names to the path so that all the
-# scripts can be found
-# finding all the subdirectories in current folder
-dirs = [name for name in os.listdir('./MarESA/Scripts/')
-            if os.path.isdir(os.path.join('./MarESA/Scripts/', name))]
-# removing the Data folder
-rem_dirs = ['Data', 'Output']
-dirs = [dd for dd in dirs if dd not in rem_dirs]
-# adding each of the directories to the path
-for dd in dirs:
-    sys.path.append('./MarESA/Scripts/' + dd)
-
-print('\n\n')
-
-########################################################################
-#
-#                   Off-shore aggregation
-#
-########################################################################
-
-########################################################################
-# Title: JNCC MarESA Sensitivity Aggregation (EUNIS)
-
-import SensitivityAggregationOffshore as SAO
-SAO.main(marESA_file, bioregions_ext,output_file)
-
-# ########################################################################
-# # Title: JNCC MarESA Resistance Aggregation (EUNIS)
-
-import ResistanceAggregationOffshore as RtAO
-# running the resistance script
-# getting the resistance output file name to use later in the bs3 script
-offshore_res_file = RtAO.main(marESA_file, bioregions_ext,output_file)
-
-# ########################################################################
-# # Title: JNCC MarESA Resilience Aggregation (EUNIS)
-
-import ResilienceAggregationOffshore as RcAO
-# running the script offshore resilience script
-# getting the resilience output file name to use later in the bs3 script
-offshore_resil_file = RcAO.main(marESA_file, bioregions_ext,output_file)
-
-########################################################################
-#
-#                  Deep Sea Bed aggregation
-#
-########################################################################
-
-########################################################################
-# Title: Deep Seabed Sensitivity Aggregation
-
-import DeepSeabed_Sens_Agg as DSA
-DSA.main(marESA_file, EnglishOffshore,output_file)
-
-# ########################################################################
-# # Title: Deep Seabed Resilience Aggregation
-
-# import DeepSeabed_Resil_Agg as DRA
-# DRA.main(marESA_file, EnglishOffshore)
-# Present in Canyons MCZ?
-
-# ########################################################################
-# # Title: MCZ Wales Inshore Broadscale Habitat Sensitivity Aggregation
-
-import MCZ_Wales_In_BSH_Sens_Agg as MWB
-MWB.main(marESA_file, WelshBSH,output_file)
-
-########################################################################
-#
-#                 OSPAR: Common Indicator Extent of Physical
-#               Damage to predominant and special habitats (BH3)
-#
-########################################################################
+# The aggregations are run as a graph of tasks - each task is started as
+# soon as the tasks it depends on are completed, and tasks which do not
+# depend on each other are run at the same time on separate processes.
+# Set a task's 'run' value to False to leave it out of the run.
+from AggregationScheduler import run_tasks, task_result
+from AggregationManifest import MANIFEST_FILE
+
+# Number of aggregations run at the same time (one per CPU core). Set to
+# 1 to run the aggregations one after another
+processes = os.cpu_count()
+
+# Aggregations whose input data files and scripts are unchanged since a
+# previous run reuse the outputs of that run (copied into this run's
+# output folder) rather than being run again. The outputs of each run
+# are recorded within ./MarESA/Output/AggregationManifest.json. Set to
+# True to run every aggregation regardless
+rebuild_all = False
+
+# Format of the aggregation outputs - 'csv', 'csv.gz' or 'csv.zst' for
+# compressed csv (zstd requires the zstandard library), 'parquet' for
+# smaller files which are quicker to load, or 'parquet-partitioned' for
+# a folder of Parquet files with one file per pressure for the offshore
+# outputs (Parquet requires the pyarrow library)
+output_format = 'csv'
+
+# Number of worker processes each offshore aggregation splits its
+# roll-up across (one partition per pressure). The outputs are the same
+# for any number of processes. Leave at 1 while the offshore tasks run
+# alongside the other aggregations; raise it (e.g. to os.cpu_count())
+# when only the offshore aggregations are being run
+offshore_processes = 1
 
 #############################################################
-# Title: OSPAR BH3 Sensitivity Calculation
 
-# import BH3_SensitivityCalculation as BH3SC
-# BH3SC.main(offshore_res_file, offshore_resil_file,output_file)
 
-########################################################################
-#
-#                 MCZ Feature of Conservation Importance
-#                           (FOCI) Aggregations
-#
-########################################################################
-
-#############################################################
-# MCZ Offshore FeatureOfConservationImportance (FOCI) Sensitivity Aggregation
-
-import MCZ_Off_FOCI_Sens_Agg as MOFS
-MOFS.main(marESA_file, EnglishOffshore,output_file)
+# Function Title: aggregation_tasks
+def aggregation_tasks(inputs):
+    """User defined function to return the aggregation tasks of this run, each sharing the input data store"""
+    tasks = []
+
+    ########################################################################
+    #
+    #                   Off-shore aggregation
+    #
+    ########################################################################
+
+    ########################################################################
+    # Title: JNCC MarESA Offshore Aggregation (EUNIS)
+
+    # The sensitivity, resistance and resilience aggregations are run as
+    # separate tasks so that they run at the same time. Each returns its
+    # output file name - the resistance and resilience file names are used
+    # later in the BH3 script
+
+    tasks.append(aggregation_task(
+        'SAO', args=[marESA_file, bioregions_ext, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format, 'processes': offshore_processes},
+        data=[marESA_file, bioregions_ext, cor_table], output=output_file))
+    tasks.append(aggregation_task(
+        'RtAO', args=[marESA_file, bioregions_ext, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format, 'processes': offshore_processes},
+        data=[marESA_file, bioregions_ext, cor_table], output=output_file))
+    tasks.append(aggregation_task(
+        'RcAO', args=[marESA_file, bioregions_ext, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format, 'processes': offshore_processes},
+        data=[marESA_file, bioregions_ext, cor_table], output=output_file))
+
+    ########################################################################
+    #
+    #                  Deep Sea Bed aggregation
+    #
+    ########################################################################
+
+    ########################################################################
+    # Title: Deep Seabed Sensitivity Aggregation
+
+    tasks.append(aggregation_task(
+        'DSA', args=[marESA_file, EnglishOffshore, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format},
+        data=[marESA_file, EnglishOffshore], output=output_file))
+
+    # ########################################################################
+    # # Title: Deep Seabed Resilience Aggregation
+
+    # import DeepSeabed_Resil_Agg as DRA
+    # DRA.main(marESA_file, EnglishOffshore)
+    # Present in Canyons MCZ?
+
+    # ########################################################################
+    # # Title: MCZ Wales Inshore Broadscale Habitat Sensitivity Aggregation
+
+    tasks.append(aggregation_task(
+        'MWB', args=[marESA_file, WelshBSH, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format},
+        data=[marESA_file, WelshBSH], output=output_file))
+
+    ########################################################################
+    #
+    #                 OSPAR: Common Indicator Extent of Physical
+    #               Damage to predominant and special habitats (BH3)
+    #
+    ########################################################################
+
+    #############################################################
+    # Title: OSPAR BH3 Sensitivity Calculation
+
+    # Runs once the offshore resistance and resilience aggregations are
+    # completed. If these are not part of the run, the offshore_res_file and
+    # offshore_resil_file outputs entered above are used instead
+    tasks.append(aggregation_task(
+        'BH3', args=[task_result('RtAO', offshore_res_file), task_result('RcAO', offshore_resil_file),
+                     output_file],
+        kwargs={'output_format': output_format},
+        run=False))
+
+    ########################################################################
+    #
+    #                 MCZ Feature of Conservation Importance
+    #                           (FOCI) Aggregations
+    #
+    ########################################################################
+
+    #############################################################
+    # MCZ Offshore FeatureOfConservationImportance (FOCI) Sensitivity Aggregation
+
+    tasks.append(aggregation_task(
+        'MOFS', args=[marESA_file, EnglishOffshore, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format},
+        data=[marESA_file, EnglishOffshore], output=output_file))
+
+    # #############################################################
+    # # MCZ Offshore Feature of Conservation Importance (FOCI) Resilience Aggregation
+
+    # import MCZ_Off_FOCI_Resil_Agg as MOFR
+    # MOFR.main(marESA_file, EnglishOffshore)
+    # ['Habitat of Conservation Importance (HOCI)', 'Sub-split: Bioregion?', 'Biotope name'] not in index"
+
+    # #############################################################
+    # # MCZ Wales Inshore Feature of Conservation Importance Sensitivity Aggregation
+
+    tasks.append(aggregation_task(
+        'MWIFC', args=[marESA_file, WelshFOCI, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format},
+        data=[marESA_file, WelshFOCI], output=output_file))
+
+    ########################################################################
+    #
+    #                Habitats Directive Annex I Aggregations
+    #
+    ########################################################################
+
+    #############################################################
+    # Title: Annex I England and Wales Offshore Sensitivity Aggregation
+
+    tasks.append(aggregation_task(
+        'AEWOS', args=[marESA_file, EngWel_Annex1, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format},
+        data=[marESA_file, EngWel_Annex1], output=output_file))
+
+    # #############################################################
+    # # Title: Annex I England and Wales Offshore Resilience Aggregation
+
+    # import AnxI_EngWales_Off_Resil_Agg as AEWOR
+    # AEWOR.main(marESA_file, EngWel_Annex1,output_file)
+    #['Subregion', 'Annex I sub feature type', 'Biotope name']
+
+    # #############################################################
+    # # Title: Annex I  Scotland Inshore & Offshore Sensitivity Aggregation
+
+    # SHOUD NOT WORK - old one
+    # import AnxI_Scot_InOff_Sens_Agg as ASIOS
+    # ASIOS.main(marESA_file, Scot_Annex1,output_file)
+    # df1.loc[:, '_tmpkey'] = 1
+
+    #############################################################
+    # Title: Annex I  Scotland Offshore Sensitivity Aggregation
+
+    # SHOUDL WORK
+    tasks.append(aggregation_task(
+        'ASOS', args=[marESA_file, Scot_Annex1, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format},
+        data=[marESA_file, Scot_Annex1], output=output_file))
+
+    ########################################################################
+    #
+    #            NCMPA Priority Marine Feature (PMF Aggregation)
+    #
+    ########################################################################
+
+    #############################################################
+    # Title: PMF Offshore Sensitivity Aggregation
+
+    tasks.append(aggregation_task(
+        'POSAED', args=[marESA_file, Scot_PMF, output_file],
+        kwargs={'inputs': inputs, 'output_format': output_format},
+        data=[marESA_file, Scot_PMF], output=output_file))
+
+    ########################################################################
+    #
+    #                           Aggregation Audit Log
+    #
+    ########################################################################
+
+    # Execute the Aggregation Audit Log once every other aggregation is completed
+    # Run alongside a QA script and a file send script
+    tasks.append(aggregation_task(
+        'Audit', kwargs={'audit': True, 'send': True, 'output_file': output_file},
+        after=[task['name'] for task in tasks], run=False))
+
+    return tasks
+
+
+# Function Title: run_aggregations
+def run_aggregations():
+    """User defined function to load the input data and run every aggregation task"""
+    # Test the run time of the function
+    start = time.time()
+
+    # Set the overall directory and create the output folder
+    os.chdir(working_directory)
+    Path("./MarESA/Output/"+output_file).mkdir(parents=True, exist_ok=True)
 
-# #############################################################
-# # MCZ Offshore Feature of Conservation Importance (FOCI) Resilience Aggregation
+    print('\n\n')
 
-# import MCZ_Off_FOCI_Resil_Agg as MOFR
-# MOFR.main(marESA_file, EnglishOffshore)
-# ['Habitat of Conservation Importance (HOCI)', 'Sub-split: Bioregion?', 'Biotope name'] not in index"
+    # The MarESA extract, bioregions extract, correlation table and feature
+    # data are loaded once and shared by every aggregation within this run.
+    # The input data store (and pandas) are only imported here
+    from AggregationInputs import AggregationInputs
+    inputs = AggregationInputs(marESA_file, bioregions_ext, cor_table)
+    tasks = aggregation_tasks(inputs)
+
+    # Add the folder of each aggregation to the path, and stop before any
+    # data is loaded if an aggregation script cannot be found
+    names = [task['name'] for task in tasks if task.get('run', True)]
+    problems = validate_aggregations(names)
+    if problems:
+        raise ValueError('\n'.join(problems))
+    add_script_paths(names)
+
+    # Load the input data once, before it is handed to each aggregation
+    inputs.load(EnglishOffshore, WelshBSH, WelshFOCI, EngWel_Annex1, Scot_Annex1, Scot_PMF)
+
+    results = run_tasks(tasks, processes, None if rebuild_all else MANIFEST_FILE)
 
-# #############################################################
-# # MCZ Wales Inshore Feature of Conservation Importance Sensitivity Aggregation
+    # Stop the timer post computation and print the elapsed time
+    elapsed = (time.time() - start)
+
+    # Create print statement to indicate how long the process took and
+    # round value to 1 decimal place.
+    # print("The 'AggregationExecution' script took " + str(
+    #     round(elapsed / 60, 1)) + ' minutes to run and complete.')
+    return results
 
-import MCZ_Wales_In_FOCI_Sens_Agg as MWIFC
-MWIFC.main(marESA_file, WelshFOCI,output_file)
 
 ########################################################################
 #
-#                Habitats Directive Annex I Aggregations
+#                       B. Aggregation Execution:
 #
 ########################################################################
 
-#############################################################
-# Title: Annex I England and Wales Offshore Sensitivity Aggregation
-
-import AnxI_EngWales_Off_Sens_Agg as AEWOS
-AEWOS.main(marESA_file, EngWel_Annex1,output_file)
-
-# #############################################################
-# # Title: Annex I England and Wales Offshore Resilience Aggregation
-
-# import AnxI_EngWales_Off_Resil_Agg as AEWOR
-# AEWOR.main(marESA_file, EngWel_Annex1,output_file)
-#['Subregion', 'Annex I sub feature type', 'Biotope name']
-
-# #############################################################
-# # Title: Annex I  Scotland Inshore & Offshore Sensitivity Aggregation
-
-# SHOUD NOT WORK - old one
-# import AnxI_Scot_InOff_Sens_Agg as ASIOS
-# ASIOS.main(marESA_file, Scot_Annex1,output_file)
-# df1.loc[:, '_tmpkey'] = 1
-
-#############################################################
-# Title: Annex I  Scotland Offshore Sensitivity Aggregation
-
-# SHOUDL WORK
-import AnxI_Scot_Off_Sens_Agg as ASOS
-ASOS.main(marESA_file, Scot_Annex1,output_file)
-
-########################################################################
-#
-#            NCMPA Priority Marine Feature (PMF Aggregation)
-#
-########################################################################
-
-#############################################################
-# Title: PMF Offshore Sensitivity Aggregation
-
-import PMF_Off_Sens_Agg_ExDepth as POSAED
-POSAED.main(marESA_file, Scot_PMF,output_file)
-
-########################################################################
-#
-#                           Aggregation Audit Log
-#
-########################################################################
-
-# Execute the Aggregation Audit Log
-# Run alongside a QA script and a file send script
-import AggregationAuditLog as audit
-#audit.main(audit = True, send = True)
-
-# Stop the timer post computation and print the elapsed time
-elapsed = (time.process_time() - start)
-
-# Create print statement to indicate how long the process took and
-# round value to 1 decimal place.
-# print("The 'AggregationExecution' script took " + str(
-#     round(elapsed / 60, 1)) + ' minutes to run and complete.')
+# The aggregations are only run from the main process - the worker
+# processes import this script to find the settings above
+if __name__ == '__main__':
+    run_aggregations()
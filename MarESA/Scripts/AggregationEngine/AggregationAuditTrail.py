@@ -0,0 +1,179 @@
+########################################################################
+
+# Title: Aggregation Audit Trail
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Append-only store of the MarESA Aggregation audit
+# trail, held within an SQLite database next to the audit trail csv
+# (./MarESA/MarESAAggregation_OutputLog.sqlite). Each audit inserts only
+# the outputs of its run, rather than reading, appending to and
+# rewriting the whole audit trail. The rows cannot be updated or
+# deleted once recorded.
+
+# The file name, date created and each extract version are indexed, so
+# the outputs created from an extract can be found without reading the
+# whole audit trail, e.g.
+#   find_outputs(maresa='marESA20231107')
+# Versions are matched regardless of case.
+
+# MarESAAggregation_OutputLog_AuditTrailOnly.csv is kept as an export
+# view of the database - the new rows are appended to it after each
+# audit, and export_csv() rewrites it in full. The database is created
+# from the csv the first time it is used.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import os
+import sqlite3
+import time
+import pandas as pd
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# Location of the audit trail database and its csv export
+AUDIT_DATABASE = './MarESA/MarESAAggregation_OutputLog.sqlite'
+AUDIT_CSV = './MarESA/MarESAAggregation_OutputLog_AuditTrailOnly.csv'
+
+# Columns of the audit trail csv and the database column each is held in
+AUDIT_COLUMNS = {
+    'File Name': 'file_name',
+    'Date Created': 'date_created',
+    'Bioregions Extract Used': 'bioregions',
+    'MarESA Extract Used': 'maresa',
+    'Resistance Aggregation Used': 'resistance',
+    'Resilience Aggregation Used': 'resilience',
+}
+
+# Audit trail table - rows are numbered in the order they are recorded
+# and may only be inserted
+AUDIT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_trail (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_name TEXT NOT NULL COLLATE NOCASE,
+    date_created TEXT COLLATE NOCASE,
+    bioregions TEXT COLLATE NOCASE,
+    maresa TEXT COLLATE NOCASE,
+    resistance TEXT COLLATE NOCASE,
+    resilience TEXT COLLATE NOCASE,
+    recorded TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audit_file_name ON audit_trail (file_name);
+CREATE INDEX IF NOT EXISTS audit_date_created ON audit_trail (date_created);
+CREATE INDEX IF NOT EXISTS audit_bioregions ON audit_trail (bioregions);
+CREATE INDEX IF NOT EXISTS audit_maresa ON audit_trail (maresa);
+CREATE INDEX IF NOT EXISTS audit_resistance ON audit_trail (resistance);
+CREATE INDEX IF NOT EXISTS audit_resilience ON audit_trail (resilience);
+CREATE TRIGGER IF NOT EXISTS audit_no_update BEFORE UPDATE ON audit_trail
+BEGIN SELECT RAISE(ABORT, 'The audit trail is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS audit_no_delete BEFORE DELETE ON audit_trail
+BEGIN SELECT RAISE(ABORT, 'The audit trail is append-only'); END;
+"""
+
+# Filters of find_outputs() and the database column each searches
+AUDIT_FILTERS = {
+    'file_name': 'file_name',
+    'date': 'date_created',
+    'bioregions': 'bioregions',
+    'maresa': 'maresa',
+    'resistance': 'resistance',
+    'resilience': 'resilience',
+}
+
+#############################################################
+
+
+# Function Title: read_audit_csv
+def read_audit_csv(csv_file=AUDIT_CSV):
+    """User defined function to read the audit trail csv with every value kept as written (e.g. '20200303.0' is not
+    read as a number)"""
+    audit = pd.read_csv(csv_file, dtype=str, keep_default_na=False)
+    return audit.reindex(columns=list(AUDIT_COLUMNS), fill_value='')
+
+
+# Function Title: connect
+def connect(database=AUDIT_DATABASE, csv_file=AUDIT_CSV):
+    """User defined function to open the audit trail database, creating it if needed. A new database is filled with
+    the rows of the existing audit trail csv"""
+    new = not os.path.isfile(database)
+    connection = sqlite3.connect(database)
+    with connection:
+        connection.executescript(AUDIT_SCHEMA)
+        if new and os.path.isfile(csv_file):
+            insert_rows(connection, read_audit_csv(csv_file))
+    return connection
+
+
+# Function Title: insert_rows
+def insert_rows(connection, outputs):
+    """User defined function to insert rows of the audit trail (a DataFrame with the audit trail csv columns) into the
+    database. Returns the number of rows inserted"""
+    outputs = outputs.reindex(columns=list(AUDIT_COLUMNS)).astype(object)
+    outputs = outputs.where(outputs.notna(), None)
+    recorded = time.strftime('%Y-%m-%d %H:%M:%S')
+    connection.executemany(
+        'INSERT INTO audit_trail (' + ', '.join(AUDIT_COLUMNS.values()) + ', recorded) VALUES (' +
+        ', '.join('?' * (len(AUDIT_COLUMNS) + 1)) + ')',
+        [tuple(row) + (recorded,) for row in outputs.itertuples(index=False)])
+    return len(outputs)
+
+
+# Function Title: record_outputs
+def record_outputs(outputs, database=AUDIT_DATABASE, csv_file=AUDIT_CSV):
+    """Record the outputs of a run (a DataFrame with the audit trail csv columns) within the audit trail database and
+    append them to the audit trail csv. Only the new rows are written - the csv is only written in full where it
+    does not exist.
+
+    e.g. record_outputs(new_files)"""
+    csv_exists = os.path.isfile(csv_file)
+    connection = connect(database, csv_file)
+    try:
+        with connection:
+            insert_rows(connection, outputs)
+    finally:
+        connection.close()
+
+    if csv_exists:
+        outputs.reindex(columns=list(AUDIT_COLUMNS)).to_csv(csv_file, mode='a', header=False, index=False)
+    else:
+        export_csv(database, csv_file)
+
+
+# Function Title: read_audit_trail
+def read_audit_trail(database=AUDIT_DATABASE, where='', parameters=()):
+    """User defined function to return the rows of the audit trail database (optionally filtered by an SQL where
+    clause) in the order they were recorded, with the audit trail csv columns"""
+    connection = connect(database)
+    try:
+        audit = pd.read_sql_query('SELECT ' + ', '.join(AUDIT_COLUMNS.values()) + ' FROM audit_trail ' + where +
+                                  ' ORDER BY id', connection, params=parameters)
+    finally:
+        connection.close()
+    return audit.rename(columns={column: name for name, column in AUDIT_COLUMNS.items()})
+
+
+# Function Title: find_outputs
+def find_outputs(database=AUDIT_DATABASE, **filters):
+    """Return the audit trail rows matching every filter given (file_name, date, bioregions, maresa, resistance or
+    resilience), regardless of case, in the order they were recorded.
+
+    e.g. find_outputs(maresa='marESA20231107')
+         find_outputs(date='20240206', bioregions='Bioreg20190219')"""
+    unknown = [name for name in filters if name not in AUDIT_FILTERS]
+    if unknown:
+        raise ValueError('Unknown audit trail filters: ' + ', '.join(unknown) + ' (use ' +
+                         ', '.join(AUDIT_FILTERS) + ')')
+    where = ' AND '.join(AUDIT_FILTERS[name] + ' = ?' for name in filters)
+    return read_audit_trail(database, 'WHERE ' + where if where else '', [str(value) for value in filters.values()])
+
+
+# Function Title: export_csv
+def export_csv(database=AUDIT_DATABASE, csv_file=AUDIT_CSV):
+    """Rewrite the audit trail csv in full from the audit trail database, e.g. if the csv has been edited by hand"""
+    read_audit_trail(database).to_csv(csv_file, index=False)
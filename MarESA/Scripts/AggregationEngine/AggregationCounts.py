@@ -0,0 +1,193 @@
+########################################################################
+
+# Title: Aggregation Counts
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Shared counting engine for the MarESA
+# Aggregations. Counts the occurrence of each assessment value
+# (e.g. High, Medium, Low) within the comma separated assessment
+# strings produced when biotopes are grouped and returns the
+# 'Count_*' and presence columns used by the aggregation scripts.
+
+# This replaces the counter() / replacer() functions which were
+# previously applied row by row within each aggregation script.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import re
+import numpy as np
+import pandas as pd
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# Assessment vocabularies
+
+# Each category is defined as (presence column, string counted,
+# count column). The string counted is the value that the original
+# counter() function passed to str.count() - this is not always the
+# same as the presence column (e.g. 'Very' is counted for 'Very low').
+
+SENSITIVITY_CATEGORIES = [
+    ('High', 'High', 'Count_High'),
+    ('Medium', 'Medium', 'Count_Medium'),
+    ('Low', 'Low', 'Count_Low'),
+    ('Not sensitive', 'Not sensitive', 'Count_NotSensitive'),
+    ('Not relevant', 'Not relevant', 'Count_NotRel'),
+    ('No evidence', 'No evidence', 'Count_NoEvidence'),
+    ('Not assessed', 'Not assessed', 'Count_NotAssessed'),
+    ('Unknown', 'Unknown', 'Count_Unknown'),
+]
+
+RESISTANCE_CATEGORIES = [
+    ('High', 'High', 'Count_High'),
+    ('Medium', 'Medium', 'Count_Medium'),
+    ('Low', 'Low', 'Count_Low'),
+    ('None', 'None', 'Count_None'),
+    ('Not sensitive', 'Not sensitive', 'Count_NotSensitive'),
+    ('Not relevant', 'Not relevant', 'Count_NotRel'),
+    ('No evidence', 'No evidence', 'Count_NoEvidence'),
+    ('Not assessed', 'Not assessed', 'Count_NotAssessed'),
+    ('Unknown', 'Unknown', 'Count_Unknown'),
+]
+
+RESILIENCE_CATEGORIES = [
+    ('High', 'High', 'Count_High'),
+    ('Medium', 'Medium', 'Count_Medium'),
+    ('Low', 'Low', 'Count_Low'),
+    ('Very low', 'Very', 'Count_vLow'),
+    ('Not sensitive', 'Not sensitive', 'Count_NotSensitive'),
+    ('Not relevant', 'Not relevant', 'Count_NotRel'),
+    ('No evidence', 'No evidence', 'Count_NoEvidence'),
+    ('Not assessed', 'Not assessed', 'Count_NotAssessed'),
+    ('Unknown', 'Unknown', 'Count_Unknown'),
+]
+
+# Assessment values which show that a biotope holds a known assessment.
+# Any group which contains none of these values is made up of unknowns
+# only (OG Changes 09/22 - if the child level is unknown but the parent
+# level is known then the parent level assessment is used).
+KNOWN_ASSESSMENTS = ['Not sensitive', 'Medium', 'No evidence', 'Not relevant', 'Not assessed', 'Low', 'High', 'None',
+                     'Very low', 'Very high']
+
+#############################################################
+
+
+# Function Title: category_lookup
+def category_lookup(values, categories):
+    """User defined function to count the occurrences of each category
+    within each unique assessment string. Returns a DataFrame with one
+    row per unique value and one column per count column"""
+    # Create a Series of the unique values to allow for vectorised
+    # string counting
+    values = pd.Series(values, dtype=object)
+    # Count each category with the same (non-overlapping) semantics as
+    # str.count() used by the original counter() function
+    lookup = pd.DataFrame({
+        count_col: values.str.count(re.escape(pattern)).fillna(0).astype('int64')
+        for label, pattern, count_col in categories
+    })
+    return lookup
+
+
+# Function Title: assessment_counts
+def assessment_counts(values, categories):
+    """User defined function to count the occurrence of each category
+    within each assessment string of a Series. Returns a DataFrame with
+    the same index as the Series, one 'Count_*' column per category and
+    a 'KnownCount' column with the number of KNOWN_ASSESSMENTS found"""
+    # Convert the assessment strings to a categorical so that each
+    # unique string is only counted once
+    values = pd.Series(values)
+    codes = pd.Categorical(values)
+    lookup = category_lookup(codes.categories, categories + [(known, known, known)
+                                                            for known in KNOWN_ASSESSMENTS])
+    lookup['KnownCount'] = lookup[KNOWN_ASSESSMENTS].sum(axis=1)
+    lookup = lookup[[count_col for label, pattern, count_col in categories] + ['KnownCount']]
+    # Broadcast the counts back to each row using the category codes
+    # (missing values are left with a count of zero)
+    codes = codes.codes
+    counts = np.zeros((len(values), lookup.shape[1]), dtype='int64')
+    counts[codes >= 0] = lookup.values[codes[codes >= 0]]
+    return pd.DataFrame(counts, index=values.index, columns=lookup.columns)
+
+
+# Function Title: presence_columns
+def presence_columns(df, categories):
+    """User defined function to add the presence columns to a DataFrame
+    which already holds the 'Count_*' columns. Each presence column
+    holds the category name if the count is above zero, or 'NA'"""
+    for label, pattern, count_col in categories:
+        df[label] = np.where(df[count_col].values == 0, 'NA', label)
+    return df
+
+
+# Function Title: order_columns
+def order_columns(df, leading, categories):
+    """User defined function to return the DataFrame columns in the
+    same order as the original counter() / replacer() process"""
+    presence = [label for label, pattern, count_col in categories]
+    counts = [count_col for label, pattern, count_col in categories]
+    return df[leading + presence + counts]
+
+
+# Function Title: count_assessments
+def count_assessments(df, column, categories):
+    """Count the occurrence of each assessment value within the target
+    column of each row of the DataFrame and return the DataFrame with
+    the presence and 'Count_*' columns appended.
+
+    e.g. L4_agg = count_assessments(L4_agg, 'Sensitivity', SENSITIVITY_CATEGORIES)"""
+    counts = assessment_counts(df[column], categories)
+    leading = list(df.columns)
+    for label, pattern, count_col in categories:
+        df[count_col] = counts[count_col].values
+    df = presence_columns(df, categories)
+    return order_columns(df, leading, categories)
+
+
+# Function Title: aggregate_assessments
+def aggregate_assessments(df, keys, column, categories):
+    """Group the DataFrame by the key columns, join the assessment
+    values of each group into a comma separated string and count the
+    occurrence of each assessment value within each group.
+
+    Counts are taken from a crosstab of group against the categorical
+    codes of the assessment values, so each unique value is only
+    counted once regardless of the number of rows it appears in.
+    Categorical key columns only form groups for the combinations of
+    categories which are present within the data.
+
+    e.g. L6_processed = aggregate_assessments(original_L6_data, ['Level_6', 'Pressure', 'SubregionName'],
+                                              'Sensitivity', SENSITIVITY_CATEGORIES)"""
+    grouped = df.groupby(keys, observed=True)
+    # Join the assessment values of each group - retained for the
+    # subsequent aggregation steps
+    aggregated = grouped[column].agg(', '.join).reset_index()
+    aggregated.columns = keys + [column]
+
+    # Tabulate the number of times each unique value appears in each
+    # group and convert this to category counts with a matrix product
+    values = pd.Categorical(df[column])
+    lookup = category_lookup(values.categories, categories)
+    group_ids = grouped.ngroup().values
+    valid = (group_ids >= 0) & (values.codes >= 0)
+    value_counts = pd.crosstab(group_ids[valid], values.codes[valid])
+    counts = np.zeros((len(aggregated), len(categories)), dtype='int64')
+    if len(value_counts):
+        counts[value_counts.index.values] = value_counts.values.dot(lookup.values[value_counts.columns.values])
+
+    for position, (label, pattern, count_col) in enumerate(categories):
+        aggregated[count_col] = counts[:, position]
+    aggregated = presence_columns(aggregated, categories)
+    # Return the groups in key order (groups of categorical keys are
+    # otherwise returned in order of first appearance when only the
+    # observed categories are used)
+    aggregated = aggregated.sort_values(keys, kind='mergesort', ignore_index=True)
+    return order_columns(aggregated, keys + [column], categories)
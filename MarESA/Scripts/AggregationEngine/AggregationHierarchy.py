@@ -0,0 +1,114 @@
+########################################################################
+
+# Title: Aggregation Hierarchy
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: EUNIS hierarchy table for the MarESA offshore
+# aggregations. The table is built once from the unique EUNIS codes of
+# the MarESA extract and the JNCC Correlation Table, and holds one row
+# per EUNIS code (and per parent code) with its EUNIS level and the
+# code of each EUNIS level above it.
+
+# Each code is given a compact integer id - its row within the table.
+# The ids are given in code order, so that sorting on the ids sorts the
+# codes. The EUNIS level columns of the aggregated data and the parent
+# code of each EUNIS level are taken from the table by id, instead of
+# slicing every EUNIS code string row by row.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import numpy as np
+import pandas as pd
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# Number of characters of a EUNIS code at each EUNIS level
+# e.g. A5 (Level 2), A5.7 (Level 3), A5.71 (Level 4), A5.711 (Level 5)
+LEVEL_LENGTHS = {1: 1, 2: 2, 3: 4, 4: 5, 5: 6, 6: 7}
+
+# EUNIS level columns of the hierarchy table
+LEVEL_COLUMNS = ['Level_' + str(level) for level in LEVEL_LENGTHS]
+
+#############################################################
+
+
+# Function Title: code_levels
+def code_levels(codes):
+    """User defined function to return the EUNIS level of each EUNIS code from the string length of the code. Codes
+    whose length is not that of a EUNIS level are returned as 0"""
+    lengths = pd.Series(codes, dtype=object).astype(str).str.len()
+    return lengths.map({length: level for level, length in LEVEL_LENGTHS.items()}).fillna(0).astype(int).values
+
+
+# Function Title: eunis_hierarchy
+def eunis_hierarchy(codes):
+    """Build the EUNIS hierarchy table of a list of EUNIS codes. Returns one row per unique code and parent code, in
+    code order, with the columns:
+        EUNIS_Code - the EUNIS code
+        EUNIS_ID - integer id of the code (the row number within the table)
+        EUNIS_Level - the EUNIS level as text ('1' to '6'), or None where the code is not of a EUNIS level length
+        Level_1 ... Level_6 - the code of each EUNIS level down to the level of the code, otherwise None
+        Parent_ID - the id of the code of the EUNIS level above, or -1 for Level 1 codes
+
+    e.g. hierarchy = eunis_hierarchy(pd.concat([MarESA['EUNIS_Code'], CorrelationTable['EUNIS code 2007']]))"""
+    codes = pd.Series(codes, dtype=object).dropna().astype(str).unique()
+
+    # Add the parent codes of each code, so that every parent level has a row of its own
+    levels = code_levels(codes)
+    parents = [pd.Series(codes[levels >= level]).str[0:length] for level, length in LEVEL_LENGTHS.items()]
+    codes = np.sort(pd.concat([pd.Series(codes)] + parents).unique())
+
+    hierarchy = pd.DataFrame({'EUNIS_Code': codes, 'EUNIS_ID': np.arange(len(codes))})
+    levels = code_levels(codes)
+    hierarchy['EUNIS_Level'] = np.where(levels > 0, levels.astype(str), None)
+    for level, length in LEVEL_LENGTHS.items():
+        hierarchy['Level_' + str(level)] = np.where(levels >= level, hierarchy['EUNIS_Code'].str[0:length], None)
+
+    # Find the id of the parent code of each code (the code of the EUNIS level above)
+    parent = np.full(len(hierarchy), None, dtype=object)
+    for level in range(2, len(LEVEL_LENGTHS) + 1):
+        parent[levels == level] = hierarchy['Level_' + str(level - 1)].values[levels == level]
+    hierarchy['Parent_ID'] = eunis_ids(parent, hierarchy)
+    return hierarchy
+
+
+# Function Title: eunis_ids
+def eunis_ids(codes, hierarchy):
+    """User defined function to return the integer id of each EUNIS code within the hierarchy table, or -1 for codes
+    which are not within the table (including missing codes)"""
+    return pd.Index(hierarchy['EUNIS_Code']).get_indexer(pd.Series(codes, dtype=object))
+
+
+# Function Title: take_ids
+def take_ids(values, ids):
+    """User defined function to return the values of the hierarchy table column at each id, with None for an id of
+    -1"""
+    return np.where(ids >= 0, values.astype(object)[ids], None)
+
+
+# Function Title: eunis_levels
+def eunis_levels(codes, hierarchy):
+    """Return the EUNIS level and the Level_1 ... Level_6 columns of each EUNIS code, taken from the hierarchy table.
+    The returned DataFrame has the same index as the Series of codes.
+
+    e.g. levels = eunis_levels(bioreg_maresa_merge['EUNIS_Code'], hierarchy)"""
+    ids = eunis_ids(codes, hierarchy)
+    return pd.DataFrame({col: take_ids(hierarchy[col].values, ids) for col in ['EUNIS_Level'] + LEVEL_COLUMNS},
+                        index=codes.index)
+
+
+# Function Title: parent_codes
+def parent_codes(codes, hierarchy):
+    """Return the code of the EUNIS level above each EUNIS code, taken from the hierarchy table by id.
+
+    e.g. L6['Level_5'] = parent_codes(L6['Level_6'], hierarchy)"""
+    ids = eunis_ids(codes, hierarchy)
+    parent_ids = np.where(ids >= 0, hierarchy['Parent_ID'].values[ids], -1)
+    return take_ids(hierarchy['EUNIS_Code'].values, parent_ids)
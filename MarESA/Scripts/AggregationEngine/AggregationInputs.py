@@ -0,0 +1,148 @@
+########################################################################
+
+# Title: Aggregation Inputs
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Run-scoped store of the input data used by the
+# MarESA Aggregations. The MarESA extract, the bioregions extract, the
+# JNCC Correlation Table and the feature data sets are read (and the
+# MarESA extract cleaned and filled with 'Unknown' values) the
+# first time they are requested. Every later request within the same
+# run is served from memory.
+
+# Each aggregation receives its own copy of the cached data, so an
+# aggregation which edits its data in place cannot change the data
+# seen by the aggregations which follow it.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import numpy as np
+import pandas as pd
+
+from AggregationHierarchy import eunis_hierarchy
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+
+# Function Title: fill_missing_maresa_rows
+def fill_missing_maresa_rows(df):
+    """User defined function to add an 'Unknown' assessment for every habitat and pressure combination which is not
+    present within the MarESA extract"""
+    hab_cols = ['habitatID', 'JNCC_Code', 'JNCC_Name', 'EUNIS_Code', 'EUNIS_Name',
+                'Biological_zone', 'Zone', 'habitatInformationReviewDate', 'url']
+    pressure_cols = ['NE_Code', 'Pressure']
+    res_cols = ['Resistance', 'ResistanceQoE', 'ResistanceAoE', 'ResistanceDoE',
+                'Resilience', 'ResilienceQoE', 'ResilienceAoE', 'ResilienceDoE',
+                'Sensitivity', 'SensitivityQoE', 'SensitivityAoE', 'SensitivityDoE']
+
+    # keep the first row of each habitat and pressure
+    df_final = df.drop_duplicates(['habitatID', 'Pressure'])
+
+    # finding all the unique habitats and pressures - the first set of habitat
+    # values of each habitat and the first NE code of each pressure are used
+    df_habs = df[hab_cols].drop_duplicates()
+    df_pres = df[pressure_cols].drop_duplicates()
+    hab_pos = np.flatnonzero(~df_habs.duplicated('habitatID').values)
+    pres_pos = np.flatnonzero(~df_pres.duplicated('Pressure').values)
+    habs = df_habs.iloc[hab_pos]
+    pres = df_pres.iloc[pres_pos]
+
+    # mark the habitat and pressure combinations which are present, then take
+    # the missing combinations in habitat then pressure order - the habitat x
+    # pressure cross join is never created
+    present = np.zeros((len(habs), len(pres)), dtype=bool)
+    present[pd.Index(habs['habitatID']).get_indexer(df_final['habitatID']),
+            pd.Index(pres['Pressure']).get_indexer(df_final['Pressure'])] = True
+    missing_hab, missing_pres = np.nonzero(~present)
+
+    # create the missing rows with the blank resistance columns. The index of each
+    # row is its position within the full cross join of the unique habitat and
+    # pressure rows
+    df_missing = pd.concat([habs.iloc[missing_hab].reset_index(drop=True),
+                            pres.iloc[missing_pres].reset_index(drop=True)], axis=1)
+    df_missing = df_missing.reindex(columns=hab_cols+pressure_cols+res_cols)
+    df_missing.index = hab_pos[missing_hab] * len(df_pres) + pres_pos[missing_pres]
+
+    # append the missing rows on the end of the rows with actual data
+    df_final = df_final.append(df_missing)
+
+    # blank rows should be filled with unknown to be picked up later
+    df_final[res_cols] = df_final[res_cols].fillna('Unknown')
+
+    return(df_final)
+
+
+class AggregationInputs:
+    """Input data for a single run of the MarESA Aggregations. Each data set is loaded once, on first use, and a copy
+    is returned to each aggregation.
+
+    e.g. inputs = AggregationInputs(marESA_file, bioregions_ext)
+         MarESA = inputs.maresa()"""
+
+    def __init__(self, marESA_file, bioregions_ext=None, cor_table='CorrelationTable_C16042020.xlsx',
+                 data_path='./MarESA/Data/'):
+        self.marESA_file = marESA_file
+        self.bioregions_ext = bioregions_ext
+        self.cor_table = cor_table
+        self.data_path = data_path
+        self._cache = {}
+
+    def _cached(self, key, load):
+        """Return a copy of the cached data set, loading it on first use"""
+        if key not in self._cache:
+            self._cache[key] = load()
+        return self._cache[key].copy()
+
+    def maresa(self, remove_temporary=False, fill_missing=True):
+        """Return the MarESA extract with every missing habitat and pressure combination filled as 'Unknown'.
+
+        remove_temporary - remove the temporary (TMP) EUNIS codes before filling, as these are duplicates of
+        existing EUNIS 2008 codes (OG 07/02/2023)
+        fill_missing - set to False to return the extract without the 'Unknown' rows, for aggregations which derive
+        the unknown counts themselves (see FeatureAggregation.py)"""
+        def load():
+            MarESA = self._cached('maresa_extract', lambda: pd.read_csv(self.data_path + self.marESA_file,
+                                                                        dtype={'EUNIS_Code': str}))
+            if remove_temporary:
+                MarESA = MarESA[~MarESA['EUNIS_Code'].str.contains('TMP', na=False)]
+            return fill_missing_maresa_rows(MarESA) if fill_missing else MarESA
+        return self._cached(('maresa', remove_temporary, fill_missing), load)
+
+    def bioregions(self):
+        """Return the bioregions extract"""
+        return self._cached('bioregions', lambda: pd.read_excel(self.data_path + self.bioregions_ext, dtype=str))
+
+    def correlation_table(self):
+        """Return the 'Correlations' sheet of the JNCC Correlation Table"""
+        return self._cached('correlation_table', lambda: pd.read_excel(self.data_path + self.cor_table,
+                                                                       'Correlations', dtype=str))
+
+    def eunis_hierarchy(self):
+        """Return the EUNIS hierarchy table (see AggregationHierarchy.py) of every EUNIS code within the MarESA extract
+        and the JNCC Correlation Table"""
+        return self._cached('eunis_hierarchy', lambda: eunis_hierarchy(pd.concat([
+            self.maresa(fill_missing=False)['EUNIS_Code'], self.correlation_table()['EUNIS code 2007']])))
+
+    def data_csv(self, file_name):
+        """Return a feature data set (e.g. the English offshore FOCI and BSH csv) from the data folder"""
+        return self._cached(('data_csv', file_name), lambda: pd.read_csv(self.data_path + file_name))
+
+    def load(self, *file_names):
+        """Load every data set used by the aggregations (and each of the named feature data sets) up front, so that
+        the loaded data is handed to each aggregation run on a separate process"""
+        self.maresa(fill_missing=False)
+        self.maresa(remove_temporary=True)
+        if self.bioregions_ext is not None:
+            self.bioregions()
+        self.correlation_table()
+        self.eunis_hierarchy()
+        for file_name in file_names:
+            self.data_csv(file_name)
+        return self
@@ -0,0 +1,209 @@
+########################################################################
+
+# Title: Aggregation Manifest
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Content-addressed record of the outputs created
+# by each MarESA Aggregation task. Each task is given a key made from a
+# hash of its input data files (e.g. the MarESA extract, bioregions
+# extract, correlation table and feature csv), the source code of the
+# script and of every local script it imports, and its remaining
+# arguments. The key and the output files of the task are stored within
+# a manifest next to the dated output folders in ./MarESA/Output/.
+
+# When the aggregations are rerun, a task whose key is already within
+# the manifest is not run again - its previous outputs are reused (or
+# copied into this run's output folder). Only the aggregations whose
+# inputs have changed (e.g. after an edit to the Scottish PMF csv) are
+# recalculated. Reused outputs keep their original (dated) file name.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import time
+
+#############################################################
+
+# Location of the manifest, the data folder and the output folder
+MANIFEST_FILE = './MarESA/Output/AggregationManifest.json'
+DATA_PATH = './MarESA/Data/'
+OUTPUT_PATH = './MarESA/Output/'
+
+# Folder holding all of the aggregation scripts - only imports of
+# scripts within this folder are included within the source hash
+SCRIPTS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Size of each block read when hashing a file
+BLOCK_SIZE = 1024 * 1024
+
+# Keyword arguments which only change how a task is run, not its
+# outputs (e.g. the number of worker processes of the offshore
+# aggregations) - these are left out of the task key
+EXECUTION_KWARGS = ['processes']
+
+#############################################################
+
+
+# Function Title: file_hash
+def file_hash(path):
+    """User defined function to return the SHA-256 hash of the contents of a file. The hash of a folder (e.g. a
+    'parquet-partitioned' output) covers the name and contents of each file within it"""
+    sha = hashlib.sha256()
+    paths = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+    for file_path in paths:
+        if file_path != path:
+            sha.update(os.path.basename(file_path).encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                sha.update(block)
+    return sha.hexdigest()
+
+
+# Function Title: script_path
+def script_path(module):
+    """User defined function to return the source file of a local script, or None for any other module (e.g. pandas).
+    The module is located without being imported"""
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.origin.endswith('.py'):
+        return None
+    if not os.path.abspath(spec.origin).startswith(SCRIPTS_PATH):
+        return None
+    return os.path.abspath(spec.origin)
+
+
+# Function Title: source_hashes
+def source_hashes(module, hashes=None):
+    """User defined function to return the hash of the source code of a script and of every local script it imports
+    (directly or indirectly) - this acts as the version of the script"""
+    if hashes is None:
+        hashes = {}
+    path = script_path(module)
+    if path is None or module in hashes:
+        return hashes
+    hashes[module] = file_hash(path)
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imported = [node.module]
+        else:
+            continue
+        for name in imported:
+            source_hashes(name, hashes)
+    return hashes
+
+
+# Function Title: argument_values
+def argument_values(values, output):
+    """User defined function to return the argument values which form part of the task key. The output folder and any
+    value which is not plain data (e.g. the AggregationInputs store) are left out"""
+    return [value for value in values
+            if isinstance(value, (str, int, float, bool, list, tuple, dict, type(None))) and value != output]
+
+
+# Function Title: task_key
+def task_key(task, args, kwargs, data_hashes):
+    """Return the content-addressed key of a task from the hashes of its data files and script source code and its
+    remaining argument values. Keyword arguments which do not change the outputs (EXECUTION_KWARGS) are left out, so
+    that e.g. a change in the number of offshore worker processes still reuses the previous outputs.
+
+    data_hashes - dictionary of the hashes of data files already hashed within this run (updated in place)"""
+    for file_name in task.get('data', []):
+        if file_name not in data_hashes:
+            data_hashes[file_name] = file_hash(DATA_PATH + file_name)
+    output = task.get('output')
+    key = {
+        'module': task['module'],
+        'function': task.get('function', 'main'),
+        'args': argument_values(args, output),
+        'kwargs': {name: value for name, value in kwargs.items()
+                   if name not in EXECUTION_KWARGS and argument_values([value], output)},
+        'data': {file_name: data_hashes[file_name] for file_name in task.get('data', [])},
+        'sources': source_hashes(task['module']),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+# Function Title: output_files
+def output_files(result):
+    """User defined function to return the output file names held within the return value of a task (a file name, or
+    a list or dictionary of file names)"""
+    if isinstance(result, str):
+        return [result]
+    if isinstance(result, dict):
+        result = list(result.values())
+    if isinstance(result, (list, tuple)):
+        return [file_name for file_name in result if isinstance(file_name, str)]
+    return []
+
+
+# Function Title: load_manifest
+def load_manifest(path=MANIFEST_FILE):
+    """Load the manifest of previous task outputs, or return an empty manifest if there is no manifest"""
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+# Function Title: save_manifest
+def save_manifest(manifest, path=MANIFEST_FILE):
+    """Save the manifest - written to a temporary file first so that an interrupted run cannot leave a partial
+    manifest"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+# Function Title: reuse_outputs
+def reuse_outputs(manifest, key, task):
+    """Reuse the previous outputs of a task with the same key. Outputs held within another output folder are copied
+    into the output folder of this run. Returns (True, result) if every previous output is present and unchanged,
+    otherwise (False, None) and the task must be run"""
+    entry = manifest.get(key)
+    if entry is None or not entry['files']:
+        return False, None
+    output = task.get('output', '')
+    for file_name, sha in entry['files'].items():
+        source = OUTPUT_PATH + entry['output'] + file_name
+        if not os.path.exists(source) or file_hash(source) != sha:
+            return False, None
+    for file_name in entry['files']:
+        source = OUTPUT_PATH + entry['output'] + file_name
+        target = OUTPUT_PATH + output + file_name
+        if not os.path.exists(target):
+            os.makedirs(OUTPUT_PATH + output, exist_ok=True)
+            if os.path.isdir(source):
+                shutil.copytree(source, target)
+            else:
+                shutil.copyfile(source, target)
+    return True, entry['result']
+
+
+# Function Title: record_outputs
+def record_outputs(manifest, key, task, result):
+    """Record the outputs of a task under its key so that they can be reused by a later run"""
+    output = task.get('output', '')
+    manifest[key] = {
+        'task': task['name'],
+        'output': output,
+        'files': {file_name: file_hash(OUTPUT_PATH + output + file_name) for file_name in output_files(result)},
+        'result': result,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
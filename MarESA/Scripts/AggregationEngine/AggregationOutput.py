@@ -0,0 +1,236 @@
+########################################################################
+
+# Title: Aggregation Output
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Writer and reader for the MarESA Aggregation
+# outputs. Outputs are written as csv (the default), as gzip or zstd
+# compressed csv, as Parquet, or as a folder of Parquet files with one
+# file per partition of the output (e.g. one per pressure).
+
+# The Parquet outputs store the repetitive text columns (e.g. Pressure,
+# SubregionName and the EUNIS Level codes) as dictionary encoded
+# categorical columns, which gives much smaller files that are quicker
+# to load than the wide csv outputs. Parquet requires the pyarrow
+# library and zstd compression requires the zstandard library.
+
+# Outputs can be written in chunks with write_chunks() - each chunk of
+# rows is written as soon as it is produced, so only one chunk of a
+# large output (e.g. the offshore MasterFrame) is held in memory. The
+# csv outputs written in chunks are identical to those written in one
+# go.
+
+# Each output written with a run record (see AggregationRunManifest.py)
+# is recorded within the run manifest of its output folder once it is
+# written, with its row count, hash, input versions and timings.
+
+# read_output() reads any of the formats and returns the same DataFrame
+# as pd.read_csv() would for the csv output, so that the scripts which
+# use the aggregation outputs (e.g. BH3_SensitivityCalculation.py, the
+# QA script and the testing scripts) work with any format.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import gzip
+import importlib.util
+import io
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from AggregationRunManifest import record_output
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# File extension of each output format - the 'parquet-partitioned'
+# output is a folder (named without an extension) of Parquet files
+OUTPUT_FORMATS = {'csv': '.csv', 'csv.gz': '.csv.gz', 'csv.zst': '.csv.zst', 'parquet': '.parquet',
+                  'parquet-partitioned': ''}
+
+# Output formats written as csv text
+CSV_FORMATS = ['csv', 'csv.gz', 'csv.zst']
+
+# Name of each file within a 'parquet-partitioned' output folder
+PART_NAME = 'part-{:05d}.parquet'
+
+# Text columns with no more than this proportion of unique values are
+# stored as dictionary encoded categorical columns within Parquet
+CATEGORICAL_RATIO = 0.5
+
+# Name given to the index column by pd.read_csv() for the csv outputs
+INDEX_COLUMN = 'Unnamed: 0'
+
+# Text read as a missing value by pd.read_csv() (its default na_values)
+CSV_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+                 'N/A', 'NA', 'NULL', 'NaN', 'n/a', 'nan', 'null']
+
+#############################################################
+
+
+# Function Title: output_name
+def output_name(filename, output_format):
+    """User defined function to return the output file name with the file extension of the output format. Raises an
+    error before anything is written if the library required by the output format is not installed"""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError("Unknown output format '" + str(output_format) + "' - use one of: " +
+                         ', '.join(OUTPUT_FORMATS))
+    if output_format == 'csv.zst' and importlib.util.find_spec('zstandard') is None:
+        raise ImportError("The 'csv.zst' output format requires the zstandard library (pip install zstandard) - "
+                          "use 'csv.gz' for compressed csv outputs without it")
+    return os.path.splitext(filename)[0] + OUTPUT_FORMATS[output_format]
+
+
+# Function Title: open_text
+def open_text(path, output_format, mode='w'):
+    """User defined function to open a csv output for writing ('w') or reading ('r') as text, compressed as
+    required by the output format"""
+    if output_format == 'csv.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    if output_format == 'csv.zst':
+        import zstandard
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+        return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+# Function Title: categorical_columns
+def categorical_columns(df):
+    """User defined function to convert the repetitive text columns of a DataFrame to categorical columns"""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and df[col].nunique() <= CATEGORICAL_RATIO * len(df):
+            df[col] = df[col].astype('category')
+    return df
+
+
+# Function Title: write_output
+def write_output(df, outpath, filename, output_format='csv', run=None):
+    """Write an aggregation output to the output folder in the chosen format and return the file name written. The
+    file extension of the file name is replaced with that of the output format. The output is recorded within the run
+    manifest of the output folder if a run record is given (see AggregationRunManifest.py).
+
+    e.g. filename = write_output(MasterFrame, outpath, filename, 'parquet', run)"""
+    return write_chunks([df], outpath, filename, output_format, run)
+
+
+# Function Title: write_chunks
+def write_chunks(chunks, outpath, filename, output_format='csv', run=None, columns=()):
+    """Write an aggregation output from an iterable of DataFrames holding the output rows in parts (e.g. a generator
+    returning one part per pressure) and return the file name written. The csv formats and the 'parquet-partitioned'
+    format write each part as soon as it is produced, so only one part is held in memory - the 'parquet-partitioned'
+    output holds one Parquet file per part. The 'parquet' format combines the parts into one file. The output is
+    recorded within the run manifest of the output folder if a run record is given (see AggregationRunManifest.py).
+    If no part is produced, an empty output holding only the given columns is written.
+
+    e.g. filename = write_chunks(masterframe_chunks(results, 'Sensitivity'), outpath, filename, 'csv.gz', run)"""
+    filename = output_name(filename, output_format)
+    path = outpath + filename
+    write_started = time.time()
+
+    # Count the rows of each part as it is written
+    rows = []
+
+    def counted(parts):
+        for part in parts:
+            rows.append(len(part))
+            yield part
+        # Write an empty output (e.g. a header only csv) rather than an empty file or folder
+        if not rows:
+            rows.append(0)
+            yield pd.DataFrame(columns=list(columns))
+
+    chunks = counted(chunks)
+    if output_format in CSV_FORMATS:
+        with open_text(path, output_format) as f:
+            for number, chunk in enumerate(chunks):
+                chunk.to_csv(f, sep=',', header=number == 0)
+    elif output_format == 'parquet':
+        categorical_columns(pd.concat(chunks)).to_parquet(path, engine='pyarrow')
+    elif output_format == 'parquet-partitioned':
+        os.makedirs(path, exist_ok=True)
+        for part in os.listdir(path):
+            os.remove(os.path.join(path, part))
+        for number, chunk in enumerate(chunks):
+            categorical_columns(chunk).to_parquet(os.path.join(path, PART_NAME.format(number)), engine='pyarrow')
+    if run is not None:
+        record_output(outpath, filename, output_format, sum(rows), run, write_started)
+    return filename
+
+
+# Function Title: path_format
+def path_format(path):
+    """User defined function to return the output format of an output file (or folder) from its file extension"""
+    path = str(path)
+    if os.path.isdir(path):
+        return 'parquet-partitioned'
+    for name, extension in sorted(OUTPUT_FORMATS.items(), key=lambda item: -len(item[1])):
+        if extension and path.endswith(extension):
+            return name
+    return 'csv'
+
+
+# Function Title: read_output
+def read_output(path, dtype=None, index_col=None):
+    """Read an aggregation output written in any of the output formats (chosen by the file extension, or a folder for
+    the 'parquet-partitioned' format). A Parquet output is returned in the same form as pd.read_csv() returns the csv
+    output - the categorical columns are returned as text, text read as missing by pd.read_csv() (e.g. '' and 'nan')
+    is returned as NaN, the index is returned as the 'Unnamed: 0' column (unless index_col=0) and dtype=str returns
+    every value as text.
+
+    e.g. resistance_masterframeOFF = read_output('./MarESA/Output/' + resistance_file, dtype=str)"""
+    file_format = path_format(path)
+    if file_format == 'csv':
+        return pd.read_csv(path, dtype=dtype, index_col=index_col)
+    if file_format in CSV_FORMATS:
+        with open_text(path, file_format, 'r') as f:
+            return pd.read_csv(f, dtype=dtype, index_col=index_col)
+
+    if file_format == 'parquet-partitioned':
+        # The parts are returned to the order of the output rows
+        parts = sorted(part for part in os.listdir(path) if part.endswith(OUTPUT_FORMATS['parquet']))
+        if parts:
+            df = pd.concat([pd.read_parquet(os.path.join(path, part), engine='pyarrow') for part in parts])
+            df = df.sort_index(kind='mergesort')
+        else:
+            # A folder with no parts holds an empty output
+            df = pd.DataFrame()
+    else:
+        df = pd.read_parquet(path, engine='pyarrow')
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    if index_col is None:
+        df.index.name = INDEX_COLUMN
+        df = df.reset_index()
+    elif index_col != 0:
+        raise ValueError('Only index_col=0 is supported for Parquet outputs')
+    return csv_values(df, dtype)
+
+
+# Function Title: csv_values
+def csv_values(df, dtype=None):
+    """User defined function to return the values of a Parquet output as pd.read_csv() returns them from the csv
+    output - text read as missing by pd.read_csv() (e.g. '' and 'nan') is returned as NaN and, unless dtype=str, text
+    columns holding only numbers (or only missing values) are returned as numbers"""
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(~df[col].isin(CSV_NA_VALUES), np.nan)
+            if dtype is None and len(df[col]):
+                try:
+                    df[col] = pd.to_numeric(df[col])
+                except (ValueError, TypeError):
+                    pass
+        if dtype is str:
+            df[col] = df[col].where(df[col].isnull(), df[col].astype(str))
+    return df
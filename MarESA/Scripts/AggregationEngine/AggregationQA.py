@@ -0,0 +1,158 @@
+########################################################################
+
+# Title: Aggregation QA
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Consistency checks of the MarESA Aggregation
+# outputs. Checks that the assessed and unassessed counts of each
+# EUNIS level are made up of the counts of the level below, e.g. that
+# the L5_AssessedCount of A5.27 in a subregion under a pressure equals
+# the sum of the L6_AssessedCount values of the A5.27x biotopes.
+
+# The count strings (e.g. 'H(3), M(2)') are parsed once into an integer
+# column per abbreviation. The child counts are summed for each
+# (Pressure, parent level, SubregionName) group and joined onto the
+# counts of the parent, so that every group of a level is checked at
+# once rather than by filtering the output for each group in turn.
+
+# e.g. failures = check_aggregations(Sens, 5, climate=CLIMATE_PRESSURES)
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import numpy as np
+import pandas as pd
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# Climate change pressures - a parent level may keep its own assessed
+# counts where the child level is unknown (if L6 unknown and L5 known
+# use L5), so mismatches are only reported for these pressures where
+# that rule does not apply
+CLIMATE_PRESSURES = ['Global warming (Extreme)', 'Global warming (High)', 'Global warming (Middle)',
+                     'Ocean Acidification (High)', 'Ocean Acidification (Middle)', 'Sea level rise (Extreme)',
+                     'Sea level rise (High)', 'Sea level rise (Middle)', 'Marine heatwaves (High)',
+                     'Marine heatwaves (Middle)']
+
+# Abbreviations of the parent counts for which the climate rule applies
+CLIMATE_RULE_COUNTS = ['NS', 'NE', 'L', 'M', 'H', 'NR', 'NA']
+
+#############################################################
+
+
+# Function Title: parse_counts
+def parse_counts(values, not_applicable=True):
+    """User defined function to parse count strings (e.g. 'H(3), M(2)') into an integer column per abbreviation, with
+    one row per value in the same order. 'Not Applicable' is counted once in its own column if not_applicable is True
+    and skipped otherwise. Missing values have no counts
+
+    e.g. parse_counts(['H(3), M(2)', 'Not Applicable']) -> H: [3, 0], M: [2, 0], Not Applicable: [0, 1]"""
+    values = pd.Series(values).reset_index(drop=True)
+    items = values[values.notna()].astype(str).str.split(',').explode().str.strip()
+    items = items[items != '']
+    measure = items.str.split('(').str[0]
+    if not not_applicable:
+        items, measure = items[measure != 'Not Applicable'], measure[measure != 'Not Applicable']
+    count = items.str.extract(r'\((.+)\)', expand=False)
+    count = count.where(measure != 'Not Applicable', '1').astype(int)
+    counts = count.groupby([count.index, measure.values]).sum().unstack(fill_value=0)
+    return counts.reindex(range(len(values)), fill_value=0)
+
+
+# Function Title: group_counts
+def group_counts(values, groups, index, not_applicable=True):
+    """User defined function to parse count strings and sum the counts of each group, returned with a row for every
+    group in the index"""
+    counts = parse_counts(values, not_applicable)
+    return counts.groupby(np.asarray(groups)).sum().reindex(index, fill_value=0)
+
+
+# Function Title: counts_differ
+def counts_differ(left, right):
+    """User defined function to return a boolean Series which is True for each row where the counts of two count
+    tables (of the same index) differ for any abbreviation"""
+    columns = left.columns.union(right.columns)
+    left = left.reindex(columns=columns, fill_value=0)
+    right = right.reindex(columns=columns, fill_value=0)
+    return (left != right).any(axis=1)
+
+
+# Function Title: check_aggregations
+def check_aggregations(df, level, climate=CLIMATE_PRESSURES):
+    """Return the rows of each (Pressure, Level_{level - 1}, SubregionName) group whose Level_{level - 1} assessed or
+    unassessed counts are not the sum of the counts of the Level_{level} entries within the group. The rows of a group
+    are returned once for each failed check, in the order the groups appear within df. A group is failed where:
+        - the parent counts are missing but the child counts are not
+        - every child count is 'Not Applicable'
+        - the summed child counts differ from the parent counts, for a climate pressure where the climate rule
+          (if L6 unknown and L5 known use L5) does not apply
+
+    e.g. L5_L4_failures = check_aggregations(Sens, 5)"""
+    parent = 'Level_' + str(level - 1)
+    child = 'Level_' + str(level)
+    parent_assessed = 'L' + str(level - 1) + '_AssessedCount'
+    parent_unassessed = 'L' + str(level - 1) + '_UnassessedCount'
+    child_assessed = 'L' + str(level) + '_AssessedCount'
+    child_unassessed = 'L' + str(level) + '_UnassessedCount'
+
+    # Group the rows by pressure, parent level and subregion - rows missing any of these are not checked
+    rows = df.reset_index(drop=True)
+    keys = ['Pressure', parent, 'SubregionName']
+    rows = rows[rows[keys].notna().all(axis=1)]
+    rows['Group'] = rows.groupby(keys, sort=False).ngroup().values
+
+    # One entry of each child level within a group, the first of which holds the parent counts of the group
+    children = rows.drop_duplicates(['Group', child])
+    first = children.drop_duplicates('Group').set_index('Group')
+    groups = first.index
+
+    assessed, unassessed = children[child_assessed], children[child_unassessed]
+    child_flags = pd.DataFrame({
+        'Group': children['Group'].values,
+        'Missing': (assessed.isna() & unassessed.isna()).values,
+        'AssessedNA': (assessed == 'Not Applicable').values,
+        'UnassessedNA': (unassessed == 'Not Applicable').values,
+        'AssessedCounted': (assessed.notna() & (assessed != 'Not Applicable')).values,
+        'UnassessedCounted': (unassessed.notna() & (unassessed != 'Not Applicable')).values,
+    }).groupby('Group')
+    entries = child_flags.size()
+    any_flags = child_flags.any()
+    all_flags = child_flags.all()
+
+    # Parse the counts once - the child counts are summed for each group and compared with the parent counts
+    parent_assessed_counts = parse_counts(first[parent_assessed]).set_axis(groups)
+    parent_unassessed_counts = parse_counts(first[parent_unassessed]).set_axis(groups)
+    assessed_differ = counts_differ(group_counts(assessed, children['Group'], groups, False), parent_assessed_counts)
+    unassessed_differ = counts_differ(group_counts(unassessed, children['Group'], groups, False),
+                                      parent_unassessed_counts)
+
+    # Climate rule - the parent keeps its own counts where the child level is unknown and the parent is known
+    known = pd.concat([parent_assessed_counts, parent_unassessed_counts], axis=1)
+    known = known.loc[:, known.columns.isin(CLIMATE_RULE_COUNTS)].sum(axis=1) > 0
+    first_assessed, first_unassessed = first[child_assessed], first[child_unassessed]
+    assessed_rule = (first_assessed == 'Not Applicable') & (first_unassessed == 'Unknown') & known
+    unassessed_rule = (first_unassessed.astype(str).str.split('(').str[0] == 'UN') & known
+    is_climate = first['Pressure'].isin(climate)
+
+    # Groups where the child level is missing are not checked
+    checked = ~((entries == 1) & any_flags['Missing'])
+    missing = checked & first[parent_assessed].isna() & first[parent_unassessed].isna()
+    not_applicable = checked & ~missing & all_flags['AssessedNA'] & all_flags['UnassessedNA']
+    compared = checked & ~missing & ~not_applicable & is_climate
+    assessed_failed = compared & any_flags['AssessedCounted'] & assessed_differ & ~assessed_rule
+    unassessed_failed = compared & any_flags['UnassessedCounted'] & unassessed_differ & ~unassessed_rule
+
+    # Return the rows of each failed group once per failed check
+    failures = (missing | not_applicable).astype(int) + assessed_failed.astype(int) + unassessed_failed.astype(int)
+    failures = failures[failures > 0]
+    failed = pd.DataFrame({'Group': failures.index.repeat(failures.values)})
+    failed['Check'] = failed.groupby('Group').cumcount()
+    failed = failed.merge(pd.DataFrame({'Group': rows['Group'].values, 'Position': np.arange(len(rows))}), on='Group')
+    failed = failed.sort_values(['Group', 'Check', 'Position'])
+    return rows.drop(columns='Group').iloc[failed['Position'].values].reset_index(drop=True)
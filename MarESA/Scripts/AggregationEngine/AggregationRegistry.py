@@ -0,0 +1,145 @@
+########################################################################
+
+# Title: Aggregation Registry
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Registry of the MarESA Aggregation scripts. Each
+# aggregation is listed with the script (module) to run and the folder
+# within ./MarESA/Scripts/ that holds it, so that only the folders of
+# the aggregations being run are added to the path and each script is
+# only imported (with pandas and the rest of its libraries) when it is
+# run. Nothing is imported or read when this script is imported, so
+# listing or validating the aggregations takes a few milliseconds.
+
+# e.g. add_script_paths(['SAO', 'MOFS'])
+#      tasks.append(aggregation_task('SAO', args=[marESA_file, bioregions_ext, output_file]))
+
+# Run this script on its own to list every registered aggregation and
+# check that each script can be found.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import importlib
+import os
+import sys
+
+#############################################################
+
+# Folder holding all of the aggregation script folders
+SCRIPTS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Folder of the shared aggregation engine, which every aggregation uses
+ENGINE_FOLDER = 'AggregationEngine'
+
+# Aggregations which can be run. Entry keys:
+#   title  - name of the aggregation
+#   module - name of the script to import
+#   folder - folder of the script within ./MarESA/Scripts/
+
+AGGREGATIONS = {
+    'SAO': {'title': 'Offshore sensitivity aggregation (EUNIS)',
+            'module': 'SensitivityAggregationOffshore', 'folder': 'BSH_Agg_OffshoreSensitivity'},
+    'RtAO': {'title': 'Offshore resistance aggregation (EUNIS)',
+             'module': 'ResistanceAggregationOffshore', 'folder': 'BSH_Agg_OffshoreSensitivity'},
+    'RcAO': {'title': 'Offshore resilience aggregation (EUNIS)',
+             'module': 'ResilienceAggregationOffshore', 'folder': 'BSH_Agg_OffshoreSensitivity'},
+    'DSA': {'title': 'Deep seabed sensitivity aggregation',
+            'module': 'DeepSeabed_Sens_Agg', 'folder': 'BSH_Agg_DeepSeaBedSensitivity'},
+    'MWB': {'title': 'MCZ Wales inshore broadscale habitat sensitivity aggregation',
+            'module': 'MCZ_Wales_In_BSH_Sens_Agg', 'folder': 'BSH_Agg_DeepSeaBedSensitivity'},
+    'BH3': {'title': 'OSPAR BH3 sensitivity calculation',
+            'module': 'BH3_SensitivityCalculation', 'folder': 'BH3CalculationScripts'},
+    'MOFS': {'title': 'MCZ offshore FOCI sensitivity aggregation',
+             'module': 'MCZ_Off_FOCI_Sens_Agg', 'folder': 'MCZFOCIAggregationScripts'},
+    'MWIFC': {'title': 'MCZ Wales inshore FOCI sensitivity aggregation',
+              'module': 'MCZ_Wales_In_FOCI_Sens_Agg', 'folder': 'MCZFOCIAggregationScripts'},
+    'AEWOS': {'title': 'Annex I England and Wales offshore sensitivity aggregation',
+              'module': 'AnxI_EngWales_Off_Sens_Agg', 'folder': 'AnnexIAggregationScripts'},
+    'ASOS': {'title': 'Annex I Scotland offshore sensitivity aggregation',
+             'module': 'AnxI_Scot_Off_Sens_Agg', 'folder': 'AnnexIAggregationScripts'},
+    'POSAED': {'title': 'PMF offshore sensitivity aggregation',
+               'module': 'PMF_Off_Sens_Agg_ExDepth', 'folder': 'PMFAggregationScripts'},
+    'Audit': {'title': 'Aggregation audit log',
+              'module': 'AggregationAuditLog', 'folder': 'AuditScripts'},
+}
+
+#############################################################
+
+
+# Function Title: registered
+def registered(name):
+    """User defined function to return the registry entry of an aggregation, raising a ValueError for unknown
+    names"""
+    if name not in AGGREGATIONS:
+        raise ValueError("Unknown aggregation '" + str(name) + "' - registered aggregations: " +
+                         ', '.join(AGGREGATIONS))
+    return AGGREGATIONS[name]
+
+
+# Function Title: script_file
+def script_file(name):
+    """User defined function to return the path of the script of an aggregation (whether or not it exists)"""
+    entry = registered(name)
+    return os.path.join(SCRIPTS_PATH, entry['folder'], entry['module'] + '.py')
+
+
+# Function Title: add_script_paths
+def add_script_paths(names=None):
+    """Add the aggregation engine and the script folders of the named aggregations (default: every registered
+    aggregation) to the path, so that the scripts can be imported by module name. Folders already on the path are
+    not added again"""
+    names = list(AGGREGATIONS) if names is None else names
+    folders = [ENGINE_FOLDER] + [registered(name)['folder'] for name in names]
+    for folder in folders:
+        path = os.path.join(SCRIPTS_PATH, folder)
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+# Function Title: aggregation_task
+def aggregation_task(name, **task):
+    """Return a task of the AggregationScheduler for a registered aggregation, with the name and module of the task
+    taken from the registry. Any other task keys (args, kwargs, after, run, data, output) are passed as keywords.
+
+    e.g. tasks.append(aggregation_task('MOFS', args=[marESA_file, EnglishOffshore, output_file], data=[...]))"""
+    return dict({'name': name, 'module': registered(name)['module']}, **task)
+
+
+# Function Title: validate_aggregations
+def validate_aggregations(names=None):
+    """Return a list of the problems found with the named aggregations (default: every registered aggregation) - an
+    unknown name, or a script which cannot be found. The scripts are located without being imported"""
+    problems = []
+    for name in (list(AGGREGATIONS) if names is None else names):
+        if name not in AGGREGATIONS:
+            problems.append("Unknown aggregation '" + str(name) + "'")
+        elif not os.path.isfile(script_file(name)):
+            problems.append("'" + name + "' script not found: " + script_file(name))
+    return problems
+
+
+# Function Title: load_aggregation
+def load_aggregation(name):
+    """Import and return the script of a registered aggregation - the script (and its libraries) are only imported
+    when this is called"""
+    add_script_paths([name])
+    return importlib.import_module(registered(name)['module'])
+
+
+# Function Title: list_aggregations
+def list_aggregations():
+    """User defined function to print each registered aggregation, its script and whether the script can be found"""
+    problems = validate_aggregations()
+    for name, entry in AGGREGATIONS.items():
+        found = 'found' if os.path.isfile(script_file(name)) else 'missing'
+        print(name.ljust(8) + entry['title'] + ' - ' + entry['folder'] + '/' + entry['module'] + '.py (' + found + ')')
+    return problems
+
+
+if __name__ == "__main__":
+    sys.exit(1 if list_aggregations() else 0)
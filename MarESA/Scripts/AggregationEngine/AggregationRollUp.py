@@ -0,0 +1,387 @@
+########################################################################
+
+# Title: Aggregation Roll-Up
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Shared hierarchical roll-up for the MarESA
+# offshore aggregations. Aggregates assessments from EUNIS Level 6
+# through to EUNIS Level 2 for a single assessment column (Sensitivity,
+# Resistance or Resilience) and builds the MarESA MasterFrame.
+
+# Assessment strings are counted once per biotope row and the counts
+# are then summed up the EUNIS hierarchy, rather than joining and
+# re-counting the comma separated strings at every level. The rules
+# applied at each level (e.g. using the parent assessment where all
+# child assessments are unknown - OG Changes 09/22) are the same as
+# those within the original offshore aggregation scripts.
+
+# The results of every EUNIS level are held in one long DataFrame (one
+# row per EUNIS level, code, pressure and subregion). The wide
+# MasterFrame, which repeats the results of each parent level on every
+# row below it, is only pivoted from the long results when written.
+
+# Every grouping and merge of the roll-up includes the pressure, so the
+# roll-up can also be run separately for each pressure (or pressure and
+# subregion) on a pool of worker processes - see roll_up_partitioned().
+# The results of the partitions are combined back into the row order of
+# the roll-up of the whole data, so the MasterFrame is unchanged.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from AggregationCounts import assessment_counts
+from AggregationHierarchy import eunis_hierarchy, parent_codes
+from AggregationScores import categorise_confidence, score_level
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# Columns used to group the data at each EUNIS level
+LEVEL_KEYS = {level: ['Level_' + str(level), 'Pressure', 'SubregionName'] for level in range(2, 7)}
+
+# EUNIS levels whose parent EUNIS level is exported alongside the level
+PARENT_LEVELS = [6, 5, 4, 3]
+
+# Columns of the long results of every EUNIS level
+LONG_COLUMNS = ['Level', 'Code', 'Parent', 'Pressure', 'SubregionName', 'Final', 'AssessedCount', 'UnassessedCount',
+                'AggregationConfidenceValue', 'AggregationConfidenceScore']
+
+# Columns which record the order of the rows of each EUNIS level within the roll-up:
+#   Part  - the part of the EUNIS level the row was made from (e.g. the L5 aggregated from L6, or the L5 without L6)
+#   Group - the first row of the prepared data within the group of the row (0 where not needed)
+#   Row   - the row of the prepared data the row was taken from (0 for summed rows)
+ORDER_COLUMNS = ['Part', 'Group', 'Row']
+
+# Columns by which the rows of each part of each EUNIS level are ordered within the roll-up of the whole data - the
+# summed parts are in key order and the parts taken from the prepared data are in the order of the prepared rows
+KEY_ORDER = ['Code', 'Pressure', 'SubregionName']
+PART_ORDER = {
+    6: [KEY_ORDER],
+    5: [KEY_ORDER, ['Row'], KEY_ORDER + ['Row']],
+    4: [KEY_ORDER, ['Group', 'Row'], KEY_ORDER + ['Group', 'Row']],
+    3: [KEY_ORDER],
+    2: [KEY_ORDER]
+}
+
+# Number of MasterFrame rows pivoted and written at a time
+CHUNK_SIZE = 100000
+
+# Biotopes removed from the aggregation due to the prioritisation of Level 4 assessments
+REMOVED_L6 = ['A5.7111', 'A5.7112']
+REMOVED_L5 = ['A5.711', 'A5.713', 'A5.714', 'A5.715', 'A5.716']
+
+# Level 4 biotope which is aggregated from the Level 4 assessment even
+# though A5.712 is present at Level 5 (OG 15/03/2023)
+LEVEL_4_INSERT = 'A5.71'
+
+#############################################################
+
+
+# Function Title: count_columns
+def count_columns(categories):
+    """User defined function to return the count columns which are summed up the EUNIS hierarchy"""
+    return [count_col for label, pattern, count_col in categories] + ['KnownCount']
+
+
+# Function Title: sum_counts
+def sum_counts(df, keys, count_cols):
+    """User defined function to group the DataFrame by the key columns and sum the count columns of each group"""
+    return df.groupby(keys)[count_cols].sum().reset_index()
+
+
+# Function Title: in_keys
+def in_keys(df, other, keys):
+    """User defined function to return a boolean array which is True for each row of the DataFrame whose key columns
+    are present within the other DataFrame"""
+    if not len(df) or not len(other):
+        return np.zeros(len(df), dtype=bool)
+    return pd.MultiIndex.from_frame(df[keys]).isin(pd.MultiIndex.from_frame(other[keys]))
+
+
+# Function Title: group_rows
+def group_rows(df, keys):
+    """User defined function to return the DataFrame with the rows of each group placed together, with the groups in
+    order of first appearance. This is the row order returned by the outer merges of the original scripts"""
+    return df.iloc[np.argsort(df.groupby(keys, sort=False, dropna=False).ngroup().values, kind='mergesort')]
+
+
+# Function Title: order_part
+def order_part(df, part):
+    """User defined function to record the part of the EUNIS level the rows of the DataFrame were made from, with
+    Group and Row values of 0 where these are not already present"""
+    df['Part'] = part
+    for col in ['Group', 'Row']:
+        if col not in df:
+            df[col] = 0
+    return df
+
+
+# Function Title: score_export
+def score_export(df, level, column, categories):
+    """User defined function to score a single EUNIS level and return the long results of the level"""
+    df = score_level(df, level, column, categories)
+    prefix = 'L' + str(level) + '_'
+    export = pd.DataFrame({
+        'Level': level,
+        'Code': df['Level_' + str(level)].values,
+        'Parent': df['Level_' + str(level - 1)].values if level in PARENT_LEVELS else None,
+        'Pressure': df['Pressure'].values,
+        'SubregionName': df['SubregionName'].values,
+        'Final': df[prefix + 'Final' + column].values,
+        'AssessedCount': df[prefix + 'AssessedCount'].values,
+        'UnassessedCount': df[prefix + 'UnassessedCount'].values,
+        'AggregationConfidenceValue': df[prefix + 'AggregationConfidenceValue'].values
+    }, columns=LONG_COLUMNS[:-1])
+    for col in ORDER_COLUMNS:
+        export[col] = df[col].values
+    return export
+
+
+# Function Title: roll_up
+def roll_up(prepared, column, categories, hierarchy=None, order=False):
+    """Aggregate the assessments within the target column of the prepared bioregions / MarESA data from EUNIS Level 6
+    to EUNIS Level 2. Returns the long results of every EUNIS level (see LONG_COLUMNS). The parent code of each
+    EUNIS level is taken from the EUNIS hierarchy table, which is built from the prepared data if not given.
+
+    order - keep the ORDER_COLUMNS within the results, so that the results of separate partitions of the prepared
+    data can be combined in the row order of the whole data (see combine_partitions). The Row values are taken from
+    the index of the prepared data, which must be the row number within the whole data.
+
+    e.g. results = roll_up(bioreg_maresa_merge, 'Sensitivity', SENSITIVITY_CATEGORIES, inputs.eunis_hierarchy())"""
+    count_cols = count_columns(categories)
+    if hierarchy is None:
+        hierarchy = eunis_hierarchy(prepared['EUNIS_Code'])
+
+    # Count the assessment values of each biotope row once
+    data = prepared[['Level_2', 'Level_3', 'Level_4', 'Level_5', 'Level_6', 'Pressure', 'SubregionName',
+                     'EUNIS_Level', column]]
+    counts = assessment_counts(data[column], categories)
+    for count_col in count_cols:
+        data[count_col] = counts[count_col].values
+    data['Row'] = data.index.values
+
+    original_L6_data = data[data['EUNIS_Level'] == '6']
+    original_L5_data = data[data['EUNIS_Level'] == '5']
+    original_L4_data = data[data['EUNIS_Level'] == '4']
+    k6, k5, k4, k3, k2 = [LEVEL_KEYS[level] for level in range(6, 1, -1)]
+
+    ####################################################################################################################
+
+    # Level 6
+
+    L6 = order_part(sum_counts(original_L6_data, k6, count_cols), 0)
+    L6['Level_5'] = parent_codes(L6['Level_6'], hierarchy)
+    L6 = L6[~L6['Level_6'].isin(REMOVED_L6)]
+
+    ####################################################################################################################
+
+    # Level 6 to 5 aggregation
+
+    aggregated_L6_to_L5 = order_part(sum_counts(L6, k5, count_cols), 0)
+
+    # L5 where there is no L6 - the first L5 assessment of each group is used
+    L5_without_L6 = original_L5_data[~in_keys(original_L5_data, original_L6_data, k5)]
+    L5_without_L6 = L5_without_L6.drop_duplicates(k5)
+
+    # OG Changes 09/22 - if L6 unknown but L5 known then use L5 at L5
+    L6_unknowns = aggregated_L6_to_L5[aggregated_L6_to_L5['KnownCount'] == 0]
+    L5_known = original_L5_data[original_L5_data['KnownCount'] > 0]
+    L6_Unknown_L5_known = L5_known[in_keys(L5_known, L6_unknowns, k5)].sort_values(k5, kind='mergesort')
+    aggregated_L6_to_L5 = aggregated_L6_to_L5[~in_keys(aggregated_L6_to_L5, L6_Unknown_L5_known, k5)]
+
+    L5 = pd.concat([aggregated_L6_to_L5[k5 + count_cols + ORDER_COLUMNS],
+                    order_part(L5_without_L6, 1)[k5 + count_cols + ORDER_COLUMNS],
+                    order_part(L6_Unknown_L5_known, 2)[k5 + count_cols + ORDER_COLUMNS]], ignore_index=True)
+    L5 = L5.drop_duplicates(k5)
+    L5['Level_4'] = parent_codes(L5['Level_5'], hierarchy)
+    L5 = L5[~L5['Level_5'].isin(REMOVED_L5)]
+
+    ####################################################################################################################
+
+    # Level 5 to 4 aggregation
+
+    L5_grouped = sum_counts(L5, k4, count_cols)
+    L4_agg = L5_grouped[L5_grouped['Level_4'] != LEVEL_4_INSERT]
+
+    # L4 where there is no L5 (and the A5.71 Level 4 assessments) - each L4 assessment is repeated once for every L4
+    # assessment within the same group, as in the original merge
+    group_size = original_L4_data.groupby(k4, dropna=False)['EUNIS_Level'].transform('size').values
+    repeats = group_size * ((~in_keys(original_L4_data, original_L5_data, k4)).astype(int) +
+                            (original_L4_data['Level_4'] == LEVEL_4_INSERT).values.astype(int))
+    L4_without_L5 = original_L4_data.iloc[np.repeat(np.arange(len(original_L4_data)), repeats)]
+    L4_without_L5 = group_rows(L4_without_L5, k4)
+    L4_without_L5['Group'] = L4_without_L5.groupby(k4, dropna=False)['Row'].transform('min').values
+
+    # OG Changes 09/22 - if L5 unknown but L4 known then use L4 at L4
+    L5_unknowns = L5_grouped[L5_grouped['KnownCount'] == 0]
+    L4_known = group_rows(original_L4_data[original_L4_data['KnownCount'] > 0], k4 + [column])
+    L4_known['Group'] = L4_known.groupby(k4 + [column], dropna=False)['Row'].transform('min').values
+    L5_Unknown_L4_known = L4_known[in_keys(L4_known, L5_unknowns, k4)].sort_values(k4, kind='mergesort')
+    L4_agg = L4_agg[~in_keys(L4_agg, L5_Unknown_L4_known, k4)]
+
+    L4 = pd.concat([order_part(L4_agg, 0)[k4 + count_cols + ORDER_COLUMNS],
+                    order_part(L4_without_L5, 1)[k4 + count_cols + ORDER_COLUMNS],
+                    order_part(L5_Unknown_L4_known, 2)[k4 + count_cols + ORDER_COLUMNS]], ignore_index=True)
+    L4['Level_3'] = parent_codes(L4['Level_4'], hierarchy)
+
+    ####################################################################################################################
+
+    # Level 4 to 3 and Level 3 to 2 aggregation
+
+    L3 = order_part(sum_counts(L4, k3, count_cols), 0)
+    L3['Level_2'] = parent_codes(L3['Level_3'], hierarchy)
+    L2 = order_part(sum_counts(L3, k2, count_cols), 0)
+
+    results = pd.concat([score_export(df, level, column, categories)
+                         for level, df in [(6, L6), (5, L5), (4, L4), (3, L3), (2, L2)]], ignore_index=True)
+
+    # Create categories for the confidence values of every EUNIS level in one step
+    results['AggregationConfidenceScore'] = categorise_confidence(results['AggregationConfidenceValue'])
+    return results[LONG_COLUMNS + ORDER_COLUMNS] if order else results[LONG_COLUMNS]
+
+
+# Function Title: combine_partitions
+def combine_partitions(partials):
+    """Combine the results of separate partitions of the prepared data (each from roll_up() with order=True) into the
+    results of the whole data, in the same row order as the roll-up of the whole data"""
+    results = pd.concat(partials, ignore_index=True)
+    rows = []
+    for level, parts in PART_ORDER.items():
+        for part, order_cols in enumerate(parts):
+            part_results = results[(results['Level'].values == level) & (results['Part'].values == part)]
+            rows.append(part_results.sort_values(order_cols, kind='mergesort').index.values)
+    return results.iloc[np.concatenate(rows)].drop(columns=ORDER_COLUMNS).reset_index(drop=True)
+
+
+# Function Title: roll_up_partitioned
+def roll_up_partitioned(prepared, column, categories, hierarchy=None, partition=('Pressure',), processes=None):
+    """Run the roll-up separately for each partition of the prepared data on a pool of worker processes and combine
+    the results. Every grouping and merge of the roll-up includes the pressure and subregion, so the partitions are
+    independent and the results are the same as those of roll_up() on the whole data.
+
+    partition - columns by which the prepared data is split ('Pressure', or 'Pressure' and 'SubregionName')
+    processes - number of worker processes (default: the number of CPU cores). Use 1 to run every partition one after
+    another within the current process.
+
+    e.g. results = roll_up_partitioned(bioreg_maresa_merge, 'Sensitivity', SENSITIVITY_CATEGORIES, hierarchy)"""
+    if hierarchy is None:
+        hierarchy = eunis_hierarchy(prepared['EUNIS_Code'])
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    # Only the columns used by the roll-up are sent to the worker processes, indexed by the row number within the
+    # whole data
+    data = prepared[['Level_2', 'Level_3', 'Level_4', 'Level_5', 'Level_6', 'Pressure', 'SubregionName',
+                     'EUNIS_Level', column]].reset_index(drop=True)
+    parts = [data.iloc[rows] for rows in data.groupby(list(partition), sort=False, dropna=False).indices.values()]
+
+    if processes == 1 or len(parts) < 2:
+        partials = [roll_up(part, column, categories, hierarchy, order=True) for part in parts]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(parts))) as executor:
+            partials = list(executor.map(roll_up, parts, [column] * len(parts), [categories] * len(parts),
+                                         [hierarchy] * len(parts), [True] * len(parts)))
+    return combine_partitions(partials)
+
+
+# Function Title: masterframe_plan
+def masterframe_plan(results):
+    """Return the row plan of the wide MasterFrame. The plan holds one row per MasterFrame row, with the pressure,
+    subregion and code of each EUNIS level (as categoricals) and the row of the long results used for each EUNIS
+    level (NaN where the MasterFrame row has no result at the level).
+
+    The plan is made with the same merges as the original MasterFrame - EUNIS Levels 2 and 3 are merged, then EUNIS
+    Levels 4, 5 and 6 are outer merged - so the MasterFrame rows are in the same order, but only the key columns and
+    row numbers are merged rather than every result column"""
+    codes = pd.CategoricalDtype(pd.concat([results['Code'], results['Parent']]).dropna().unique())
+    pressures = pd.CategoricalDtype(results['Pressure'].unique())
+    subregions = pd.CategoricalDtype(results['SubregionName'].unique())
+
+    tables = {}
+    for level in [2, 3, 4, 5, 6]:
+        rows = np.flatnonzero(results['Level'].values == level)
+        level_results = results.iloc[rows]
+        table = pd.DataFrame({'Level_' + str(level): level_results['Code'].astype(codes).values,
+                              'Pressure': level_results['Pressure'].astype(pressures).values,
+                              'SubregionName': level_results['SubregionName'].astype(subregions).values})
+        if level in PARENT_LEVELS:
+            table['Level_' + str(level - 1)] = level_results['Parent'].astype(codes).values
+        table['Row_' + str(level)] = rows
+        tables[level] = table
+
+    # Merge EUNIS Levels 2 and 3, then outer merge EUNIS Levels 4, 5 and 6
+    plan = pd.merge(tables[2], tables[3])
+    for level in [4, 5, 6]:
+        plan = pd.merge(plan, tables[level], how='outer')
+    return plan
+
+
+# Function Title: take_results
+def take_results(values, rows):
+    """User defined function to return the long result values at each row of the plan, with NaN where the row is
+    missing"""
+    valid = ~np.isnan(rows)
+    taken = np.full(len(rows), np.nan, dtype=float if values.dtype.kind == 'f' else object)
+    taken[valid] = values[rows[valid].astype(int)]
+    return taken
+
+
+# Function Title: pivot_masterframe
+def pivot_masterframe(results, plan, column):
+    """Return the wide MasterFrame rows of the row plan (or a part of the plan), with the results of each EUNIS level
+    taken from the long results, and the MasterFrame columns in the correct order"""
+    MasterFrame = pd.DataFrame(index=plan.index)
+    MasterFrame['Pressure'] = plan['Pressure'].astype(object).values
+    MasterFrame['SubregionName'] = plan['SubregionName'].astype(object).values
+    for level in [2, 3, 4, 5, 6]:
+        prefix = 'L' + str(level) + '_'
+        rows = plan['Row_' + str(level)].values.astype(float)
+        MasterFrame['Level_' + str(level)] = plan['Level_' + str(level)].astype(object).values
+        for long_col, wide_col in [('Final', prefix + 'Final' + column), ('AssessedCount', prefix + 'AssessedCount'),
+                                   ('UnassessedCount', prefix + 'UnassessedCount'),
+                                   ('AggregationConfidenceValue', prefix + 'AggregationConfidenceValue'),
+                                   ('AggregationConfidenceScore', prefix + 'AggregationConfidenceScore')]:
+            MasterFrame[wide_col] = take_results(results[long_col].values, rows)
+    return MasterFrame
+
+
+# Function Title: masterframe_chunks
+def masterframe_chunks(results, column, partition=None, chunk_size=CHUNK_SIZE):
+    """Pivot the long results of every EUNIS level into the wide MasterFrame one part at a time, so that only one part
+    of the MasterFrame is held in memory. Without a partition column the MasterFrame rows are returned in order, in
+    parts of chunk_size rows. With a partition column ('Pressure' or 'SubregionName') one part is returned per value
+    of the column. Each part keeps the MasterFrame index.
+
+    e.g. filename = write_chunks(masterframe_chunks(results, 'Sensitivity'), outpath, filename, output_format)"""
+    plan = masterframe_plan(results)
+    if partition is None:
+        for start in range(0, max(len(plan), 1), chunk_size):
+            yield pivot_masterframe(results, plan.iloc[start:start + chunk_size], column)
+    else:
+        codes = plan[partition].cat.codes.values
+        for code in range(len(plan[partition].cat.categories)):
+            yield pivot_masterframe(results, plan[codes == code], column)
+        # An empty MasterFrame is returned as one empty part, so that the output keeps its columns
+        if not len(plan[partition].cat.categories):
+            yield pivot_masterframe(results, plan, column)
+
+
+# Function Title: build_masterframe
+def build_masterframe(results, column):
+    """Pivot the long results of every EUNIS level into the wide MasterFrame, with the MasterFrame columns in the
+    correct order
+
+    e.g. MasterFrame = build_masterframe(roll_up(bioreg_maresa_merge, 'Sensitivity', SENSITIVITY_CATEGORIES),
+                                         'Sensitivity')"""
+    return pivot_masterframe(results, masterframe_plan(results), column)
@@ -0,0 +1,157 @@
+########################################################################
+
+# Title: Aggregation Run Manifest
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Record of the outputs written within a run of the
+# MarESA Aggregations. Each output is recorded as it is written (see
+# write_chunks() within AggregationOutput.py) as one line of the run
+# manifest held within the output folder of the run, e.g.
+# ./MarESA/Output/20240206v2/RunManifest.jsonl. Each entry holds:
+#   aggregation   - name of the aggregation output (e.g. 'OffshoreSensAgg')
+#   file, output  - file name and output folder of the output
+#   format, rows  - output format and number of rows written
+#   hash          - SHA-256 hash of the output
+#   versions      - date created and versions of the inputs used (e.g.
+#                   {'date': '20240206', 'maresa': 'marESA20231107'})
+#   inputs        - SHA-256 hash of each input file
+#   started, finished, seconds, write_seconds - timings of the output
+
+# The audit log reads the run manifest rather than searching the output
+# folder for the newest file of each aggregation and parsing the input
+# versions back out of the file names.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import json
+import os
+import time
+
+from AggregationManifest import file_hash
+
+#############################################################
+
+# Name of the run manifest within each output folder
+RUN_MANIFEST = 'RunManifest.jsonl'
+
+# Hashes of the input files already hashed by this process, keyed by
+# the path, size and modification time of the file
+INPUT_HASHES = {}
+
+#############################################################
+
+
+# Function Title: timestamp
+def timestamp(seconds):
+    """User defined function to return a time (in seconds since the epoch) as a date and time string"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))
+
+
+# Function Title: input_hashes
+def input_hashes(paths):
+    """User defined function to return the SHA-256 hash of each input file (None for a file which cannot be found).
+    Each file is only hashed once by a process unless it is changed"""
+    hashes = {}
+    for path in paths:
+        if not os.path.exists(path):
+            hashes[path] = None
+            continue
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+        if key not in INPUT_HASHES:
+            INPUT_HASHES[key] = file_hash(path)
+        hashes[path] = INPUT_HASHES[key]
+    return hashes
+
+
+# Function Title: run_record
+def run_record(aggregation, versions=None, inputs=(), started=None, date=None):
+    """Return the details of an aggregation output to be recorded within the run manifest when it is written.
+
+    versions - versions of the inputs used, as given within the output file name
+    inputs - paths of the input files, which are hashed when the output is recorded
+    started - time the aggregation started (time.time()), used for the timings of the output
+    date - date stamped within the output file name (e.g. '20240206'), recorded as the date the output was created.
+           The date the write started is recorded if not given
+
+    e.g. run = run_record('OffshoreSensAgg', {'bioregions': bioreg_version, 'maresa': maresa_version},
+                          [data_path + marESA_file, data_path + bioregions_ext], start_time, date)
+         filename = write_chunks(chunks, outpath, filename, output_format, run)"""
+    return {'aggregation': aggregation, 'versions': dict(versions or {}), 'inputs': list(inputs), 'started': started,
+            'date': date}
+
+
+# Function Title: append_entries
+def append_entries(outpath, entries):
+    """Append entries to the run manifest of an output folder. The entries are written with a single write, so that
+    the outputs of aggregations running at the same time are each recorded in full"""
+    with open(outpath + RUN_MANIFEST, 'a', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(entry, sort_keys=True) + '\n' for entry in entries))
+
+
+# Function Title: record_output
+def record_output(outpath, filename, output_format, rows, run, write_started):
+    """Record an output which has just been written within the run manifest of its output folder and return the
+    entry"""
+    finished = time.time()
+    started = run['started'] if run['started'] is not None else write_started
+    # The date stamped within the file name, so that a run crossing midnight records the date of its file name
+    date = run.get('date') or time.strftime('%Y%m%d', time.localtime(write_started))
+    entry = {
+        'aggregation': run['aggregation'],
+        'file': filename,
+        'output': outpath,
+        'format': output_format,
+        'rows': int(rows),
+        'hash': file_hash(outpath + filename),
+        'versions': dict({'date': date}, **run['versions']),
+        'inputs': input_hashes(run['inputs']),
+        'started': timestamp(started),
+        'finished': timestamp(finished),
+        'seconds': round(finished - started, 1),
+        'write_seconds': round(finished - write_started, 1),
+    }
+    append_entries(outpath, [entry])
+    return entry
+
+
+# Function Title: load_run_manifest
+def load_run_manifest(outpath):
+    """Return the entries of the run manifest of an output folder in the order they were recorded, or an empty list
+    if there is no run manifest. Incomplete lines (e.g. from an interrupted write) are skipped"""
+    if not os.path.isfile(outpath + RUN_MANIFEST):
+        return []
+    entries = []
+    with open(outpath + RUN_MANIFEST, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+# Function Title: latest_outputs
+def latest_outputs(outpath):
+    """Return the most recently recorded entry of each aggregation within the run manifest of an output folder, keyed
+    by aggregation name
+
+    e.g. latest_outputs('./MarESA/Output/20240206v2/')['OffshoreSensAgg']['file']"""
+    return {entry['aggregation']: entry for entry in load_run_manifest(outpath)}
+
+
+# Function Title: copy_entries
+def copy_entries(source, target, files):
+    """Copy the run manifest entries of output files reused from a previous run (see AggregationManifest.py) from the
+    run manifest of the previous output folder to that of this run's output folder"""
+    if os.path.abspath(source) == os.path.abspath(target):
+        return
+    entries = [dict(entry, output=target, reused_from=source) for entry in load_run_manifest(source)
+               if entry['file'] in files]
+    if entries:
+        append_entries(target, entries)
@@ -0,0 +1,223 @@
+########################################################################
+
+# Title: Aggregation Scheduler
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Runs a graph of MarESA Aggregation tasks on a pool
+# of worker processes. Each task names the script (module) to run, the
+# arguments passed to its main() function and the tasks which must be
+# completed before it can start. Tasks without any outstanding
+# dependencies are run at the same time, so the full set of
+# aggregations takes roughly as long as the slowest chain of tasks
+# rather than the sum of every task.
+
+# e.g. tasks = [
+#     {'name': 'RtAO', 'module': 'ResistanceAggregationOffshore', 'args': [marESA_file, bioregions_ext, output_file]},
+#     {'name': 'RcAO', 'module': 'ResilienceAggregationOffshore', 'args': [marESA_file, bioregions_ext, output_file]},
+#     {'name': 'BH3', 'module': 'BH3_SensitivityCalculation',
+#      'args': [task_result('RtAO'), task_result('RcAO'), output_file]},
+# ]
+# results = run_tasks(tasks)
+
+# Task keys:
+#   name     - unique name of the task
+#   module   - name of the script to import (must be on the path)
+#   function - function to call within the script (default 'main')
+#   args     - list of positional arguments
+#   kwargs   - dictionary of keyword arguments
+#   after    - names of the tasks which must be completed first
+#   run      - set to False to leave the task out of this run
+#   data     - input data files of the task (within ./MarESA/Data/) - a
+#              task with data files is only rerun when its inputs have
+#              changed (see AggregationManifest.py)
+#   output   - output folder of the task (within ./MarESA/Output/)
+
+# The return value of another task is passed as an argument with
+# task_result(), which also makes the task wait for that result.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import importlib
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from AggregationManifest import (OUTPUT_PATH, load_manifest, output_files, record_outputs, reuse_outputs, save_manifest,
+                                 task_key)
+from AggregationRunManifest import copy_entries
+
+#############################################################
+
+# Placeholder for the return value of another task. The default is used
+# if that task is not part of the run (e.g. the offshore resistance
+# output file name of a previous run)
+TaskResult = namedtuple('TaskResult', ['name', 'default'])
+
+#############################################################
+
+
+# Function Title: task_result
+def task_result(name, default=None):
+    """User defined function to pass the return value of the named task as an argument of another task"""
+    return TaskResult(name, default)
+
+
+# Function Title: run_task
+def run_task(module, function, args, kwargs):
+    """User defined function to import a script and call its function - this is executed within a worker process"""
+    return getattr(importlib.import_module(module), function)(*args, **kwargs)
+
+
+# Function Title: task_arguments
+def task_arguments(task):
+    """User defined function to return all argument values of a task"""
+    return list(task.get('args', [])) + list(task.get('kwargs', {}).values())
+
+
+# Function Title: resolve_arguments
+def resolve_arguments(task, results):
+    """User defined function to replace each task_result() argument of a task with the value it refers to"""
+    def resolve(value):
+        if isinstance(value, TaskResult):
+            return results[value.name] if value.name in results else value.default
+        return value
+    args = [resolve(value) for value in task.get('args', [])]
+    kwargs = {key: resolve(value) for key, value in task.get('kwargs', {}).items()}
+    return args, kwargs
+
+
+# Function Title: task_dependencies
+def task_dependencies(tasks, skipped=()):
+    """User defined function to return the names of the tasks which must be completed before each task can start.
+    Dependencies on skipped tasks (those which are not part of the run) are dropped, and a ValueError is raised for
+    unknown task names or circular dependencies"""
+    names = [task['name'] for task in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError('Task names must be unique: ' + ', '.join(names))
+
+    all_names = set(names) | set(skipped)
+    dependencies = {}
+    for task in tasks:
+        after = set(task.get('after', []))
+        after |= set(value.name for value in task_arguments(task) if isinstance(value, TaskResult))
+        unknown = after - all_names
+        if unknown:
+            raise ValueError("Task '" + task['name'] + "' depends on unknown task(s): " + ', '.join(sorted(unknown)))
+        dependencies[task['name']] = after & set(names)
+
+    # Check that every task can be reached (i.e. there are no circular dependencies)
+    completed = set()
+    while len(completed) < len(names):
+        ready = [name for name in names if name not in completed and dependencies[name] <= completed]
+        if not ready:
+            raise ValueError('Circular dependency between the tasks: ' +
+                             ', '.join(sorted(set(names) - completed)))
+        completed.update(ready)
+    return dependencies
+
+
+# Function Title: run_tasks
+def run_tasks(tasks, processes=None, manifest_file=None):
+    """Run each task once all of its dependencies are completed, using a pool of worker processes. Returns a
+    dictionary of the return value of each task. If a task fails, no further tasks are started and the error is
+    raised once the running tasks have finished.
+
+    processes - number of worker processes (default: the number of CPU cores). Use 1 to run every task one after
+    another within the current process.
+    manifest_file - manifest of previous task outputs. Tasks whose data files, script source code and arguments are
+    unchanged since a previous run reuse the previous outputs instead of being run again. Use None to run every
+    task."""
+    start = time.time()
+    skipped = [task['name'] for task in tasks if not task.get('run', True)]
+    tasks = [task for task in tasks if task.get('run', True)]
+    dependencies = task_dependencies(tasks, skipped)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(tasks)))
+
+    results = {}
+    pending = list(tasks)
+    task_lookup = {task['name']: task for task in tasks}
+    manifest = load_manifest(manifest_file) if manifest_file is not None else None
+    data_hashes = {}
+    keys = {}
+
+    def ready_tasks():
+        ready = [task for task in pending if dependencies[task['name']] <= set(results)]
+        for task in ready:
+            pending.remove(task)
+        return ready
+
+    def completed(name, task_start):
+        print('...' + name + ' completed in ' + str(round((time.time() - task_start) / 60, 1)) + ' minutes (' +
+              str(len(results)) + ' of ' + str(len(tasks)) + ' tasks)')
+        # Record the outputs of the task so that they can be reused by a later run
+        if name in keys and output_files(results[name]):
+            record_outputs(manifest, keys[name], task_lookup[name], results[name])
+            save_manifest(manifest, manifest_file)
+
+    def reused(task, args, kwargs):
+        # Reuse the previous outputs of a task whose inputs are unchanged
+        if manifest is None or 'data' not in task:
+            return False
+        keys[task['name']] = task_key(task, args, kwargs, data_hashes)
+        found, result = reuse_outputs(manifest, keys[task['name']], task)
+        if found:
+            results[task['name']] = result
+            # Record the reused outputs within the run manifest of this run's output folder
+            copy_entries(OUTPUT_PATH + manifest[keys[task['name']]]['output'], OUTPUT_PATH + task.get('output', ''),
+                         output_files(result))
+            print('...' + task['name'] + ' inputs are unchanged - reusing ' + ', '.join(output_files(result)) + ' (' +
+                  str(len(results)) + ' of ' + str(len(tasks)) + ' tasks)')
+        return found
+
+    print('Running ' + str(len(tasks)) + ' aggregation tasks on ' + str(processes) + ' process(es)...')
+
+    if processes == 1:
+        # Run the tasks in dependency order within the current process
+        while pending:
+            for task in ready_tasks():
+                task_start = time.time()
+                args, kwargs = resolve_arguments(task, results)
+                if reused(task, args, kwargs):
+                    continue
+                results[task['name']] = run_task(task['module'], task.get('function', 'main'), args, kwargs)
+                completed(task['name'], task_start)
+    else:
+        running = {}
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            while pending or running:
+                # Start every task whose dependencies are all completed (reused tasks are completed straight
+                # away, which may allow further tasks to start)
+                ready = ready_tasks()
+                while ready:
+                    for task in ready:
+                        args, kwargs = resolve_arguments(task, results)
+                        if reused(task, args, kwargs):
+                            continue
+                        future = executor.submit(run_task, task['module'], task.get('function', 'main'), args,
+                                                 kwargs)
+                        running[future] = (task['name'], time.time())
+                    ready = ready_tasks()
+                if not running:
+                    continue
+
+                # Wait for at least one of the running tasks to finish
+                done = wait(running, return_when=FIRST_COMPLETED)[0]
+                for future in done:
+                    name, task_start = running.pop(future)
+                    if future.exception() is not None:
+                        print('...' + name + ' failed - no further tasks will be started')
+                        pending.clear()
+                        raise future.exception()
+                    results[name] = future.result()
+                    completed(name, task_start)
+
+    print('All aggregation tasks completed in ' + str(round((time.time() - start) / 60, 1)) + ' minutes')
+    return results
@@ -0,0 +1,176 @@
+########################################################################
+
+# Title: Aggregation Scores
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Shared scoring functions for the MarESA
+# Aggregations. Creates the final assessment, assessed count,
+# unassessed count and confidence columns from the 'Count_*' columns
+# produced by AggregationCounts.py. The functions are parameterised by
+# the assessment vocabulary (e.g. SENSITIVITY_CATEGORIES) so that one
+# copy serves the Sensitivity, Resistance and Resilience aggregations.
+
+# Each function scores every row of a DataFrame at once - the strings
+# are assembled from boolean masks of the 'Count_*' columns rather
+# than by applying a function to each row.
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import numpy as np
+import pandas as pd
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# Abbreviations used within the assessed and unassessed count strings
+ABBREVIATIONS = {
+    'High': 'H', 'Medium': 'M', 'Low': 'L', 'None': 'N', 'Very low': 'vL', 'Not sensitive': 'NS',
+    'Not relevant': 'NR', 'No evidence': 'NE', 'Not assessed': 'NA', 'Unknown': 'UN'
+}
+
+# Assessment values which do not count as a completed assessment
+UNASSESSED = ['Not relevant', 'No evidence', 'Not assessed', 'Unknown']
+
+# Confidence categories - confidence values below the first threshold
+# are 'Low', values from the first up to the second threshold are
+# ' Medium' and values from the second threshold upwards are 'High'
+CONFIDENCE_THRESHOLDS = [0.33, 0.66]
+CONFIDENCE_LABELS = ['Low', ' Medium', 'High']
+
+# Order of the assessed count strings - only these abbreviations are
+# retained within the assessed count column (e.g. N() and vL() are not)
+ASSESSED_COUNT_ORDER = ['H', 'M', 'L', 'NS', 'NR']
+
+#############################################################
+
+
+# Function Title: assessed_categories
+def assessed_categories(categories):
+    """User defined function to return the (label, count column) pairs of
+    the assessed values within an assessment vocabulary, in order"""
+    return [(label, count_col) for label, pattern, count_col in categories if label not in UNASSESSED]
+
+
+# Function Title: count_column
+def count_column(categories, label):
+    """User defined function to return the count column of a label"""
+    for category_label, pattern, count_col in categories:
+        if category_label == label:
+            return count_col
+
+
+# Function Title: join_labels
+def join_labels(labels):
+    """User defined function to join a list of label arrays into one comma separated string per row. Empty labels
+    are skipped"""
+    joined = np.full(len(labels[0]) if labels else 0, '', dtype=object)
+    for label in labels:
+        joined = np.where(label == '', joined, np.where(joined == '', label, joined + ', ' + label))
+    return joined
+
+
+# Function Title: present_labels
+def present_labels(df, categories, labels):
+    """User defined function to return an array for each label holding the label where its count is above zero, or
+    an empty string"""
+    return [np.where(df[count_column(categories, label)].values > 0, label, '').astype(object) for label in labels]
+
+
+# Function Title: count_labels
+def count_labels(df, categories, labels):
+    """User defined function to return an array for each label holding its abbreviated count (e.g. 'H(3)') where the
+    count is above zero, or an empty string"""
+    values = []
+    for label in labels:
+        counts = df[count_column(categories, label)].values
+        text = ABBREVIATIONS[label] + '(' + pd.Series(counts).astype(str).values.astype(object) + ')'
+        values.append(np.where(counts > 0, text, '').astype(object))
+    return values
+
+
+# Function Title: any_present
+def any_present(df, categories, labels):
+    """User defined function to return a boolean array which is True for each row with a count above zero for any of
+    the labels"""
+    present = np.zeros(len(df), dtype=bool)
+    for label in labels:
+        present |= df[count_column(categories, label)].values > 0
+    return present
+
+
+# Function Title: final_assessment
+def final_assessment(df, categories):
+    """Return the final assessment string of each row. Assessed values are returned where present, otherwise the
+    Not relevant / No evidence / Not assessed values and finally Unknown where nothing else is present"""
+    assessed = [label for label, count_col in assessed_categories(categories)]
+    unassessed = ['Not relevant', 'No evidence', 'Not assessed']
+    value = join_labels(present_labels(df, categories, assessed))
+    value = np.where(value == '', join_labels(present_labels(df, categories, unassessed)), value)
+    return np.where(value == '', present_labels(df, categories, ['Unknown'])[0], value)
+
+
+# Function Title: combine_assessedcounts
+def combine_assessedcounts(df, categories):
+    """Combine the assessed counts of each row and return as string values, in the ASSESSED_COUNT_ORDER"""
+    assessed = [label for label, count_col in assessed_categories(categories)] + ['Not relevant']
+    ordered = [label for abbreviation in ASSESSED_COUNT_ORDER for label in assessed
+               if ABBREVIATIONS[label] == abbreviation]
+    value = join_labels(count_labels(df, categories, ordered))
+    # Where no assessed values are present, return 'Not Applicable' if any unassessed values are present
+    not_applicable = any_present(df, categories, ['No evidence', 'Not assessed', 'Unknown'])
+    return np.where(any_present(df, categories, assessed), value, np.where(not_applicable, 'Not Applicable', ''))
+
+
+# Function Title: combine_unassessedcounts
+def combine_unassessedcounts(df, categories):
+    """Combine the unassessed counts of each row and return as string values"""
+    value = join_labels(count_labels(df, categories, ['No evidence', 'Not assessed', 'Unknown']))
+    return np.where(value == '', 'Not Applicable', value)
+
+
+# Function Title: create_confidence
+def create_confidence(df, categories):
+    """Divide the total assessed counts by the total count of all data for each row and return as numerical values
+    (0 where there are no counts)"""
+    total_ass = sum(df[count_col].values for label, count_col in assessed_categories(categories))
+    total = total_ass + sum(df[count_column(categories, label)].values
+                            for label in ['No evidence', 'Not assessed', 'Unknown'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, np.round(total_ass / total, 3), 0.0)
+
+
+# Function Title: categorise_confidence
+def categorise_confidence(values, thresholds=CONFIDENCE_THRESHOLDS, labels=CONFIDENCE_LABELS):
+    """Partition and categorise confidence values by the confidence thresholds. Any number of confidence value columns
+    are binned in one step - a DataFrame of values returns a DataFrame of categories of the same shape. Missing values
+    are returned as None.
+
+    e.g. MasterFrame[score_cols] = categorise_confidence(MasterFrame[value_cols]).values"""
+    array = np.asarray(values, dtype=float)
+    binned = np.where(np.isnan(array), None,
+                      np.asarray(labels, dtype=object)[np.digitize(np.nan_to_num(array), thresholds)])
+    if isinstance(values, pd.DataFrame):
+        return pd.DataFrame(binned, index=values.index, columns=values.columns)
+    if isinstance(values, pd.Series):
+        return pd.Series(binned, index=values.index, name=values.name)
+    return binned
+
+
+# Function Title: score_level
+def score_level(df, level, column, categories):
+    """User defined function to add the final assessment, assessed count, unassessed count and confidence value
+    columns for a single EUNIS level to a DataFrame holding the 'Count_*' columns
+
+    e.g. L6_processed = score_level(L6_processed, 6, 'Sensitivity', SENSITIVITY_CATEGORIES)"""
+    prefix = 'L' + str(level) + '_'
+    df[prefix + 'Final' + column] = final_assessment(df, categories)
+    df[prefix + 'AssessedCount'] = combine_assessedcounts(df, categories)
+    df[prefix + 'UnassessedCount'] = combine_unassessedcounts(df, categories)
+    df[prefix + 'AggregationConfidenceValue'] = create_confidence(df, categories)
+    return df
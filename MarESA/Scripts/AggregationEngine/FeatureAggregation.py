@@ -0,0 +1,284 @@
+########################################################################
+
+# Title: Feature Aggregation
+
+# Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description: Shared feature-level sensitivity aggregation for
+# the MCZ FOCI and broadscale habitat (BSH), Annex I and PMF
+# aggregations. The MarESA sensitivity assessments of the biotopes
+# listed within a feature csv are grouped by pressure and by the
+# feature key columns of the designation (e.g. FOCI and Bioregion, or
+# Bioregion, Annex I habitat and sub-type) and scored with the shared
+# counting and scoring engine.
+
+# The groups are formed directly on the key columns, so the key values
+# no longer need to be combined into a single ' - ' separated string
+# (the together() function) and split apart again after the
+# aggregation (the str_split() function), which split feature names
+# containing ' - ' into the wrong columns. The key columns are held as
+# categoricals from the grouping through to the output.
+
+# Each designation is a FEATURE_AGGREGATIONS entry - a new feature
+# list only requires a new entry and a call to aggregate_features().
+
+# For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################
+
+# Import all Python libraries required
+import time
+import pandas as pd
+
+from AggregationCounts import SENSITIVITY_CATEGORIES, aggregate_assessments, order_columns, presence_columns
+from AggregationInputs import AggregationInputs
+from AggregationOutput import write_output
+from AggregationRunManifest import run_record
+from AggregationScores import (categorise_confidence, combine_assessedcounts, combine_unassessedcounts,
+                               create_confidence, final_assessment)
+
+pd.options.mode.chained_assignment = None  # default='warn'
+
+#############################################################
+
+# Feature aggregation of each designation. Entry keys:
+#   title    - name of the aggregation printed while running
+#   filter   - dictionary of feature csv column to the values retained
+#              (optional - every row is retained by default)
+#   drop     - feature csv columns dropped, after which any duplicate
+#              feature rows are removed (optional)
+#   strip    - feature csv columns stripped of whitespace. Where the
+#              'JNCC code' is stripped, the MarESA JNCC codes are too
+#   keys     - list of (feature csv column, output column) pairs that
+#              the assessments are grouped by, in output order
+#   required - output key columns whose missing ('nan') groups are
+#              removed from the output (optional)
+#   empty    - AggregatedSensitivity of the groups without any
+#              recognised assessment value (optional - default '')
+#   output   - prefix of the output file name
+
+FEATURE_AGGREGATIONS = {
+    'DeepSeabed_Sens_Agg': {
+        'title': 'Deep sea sensitivity aggregation',
+        'filter': {'BSH': ['Deep-sea bed']},
+        'drop': ['FOCI'],
+        'strip': ['JNCC code'],
+        'keys': [('BSH', 'BSH')],
+        'empty': 'Unknown',
+        'output': 'DeepSeabed_Sens_Agg_',
+    },
+    'MCZ_Off_FOCI_Sens_Agg': {
+        'title': 'MCZ offshore FOCI sensitivity',
+        'filter': {'FOCI': ['Cold-water coral reefs', 'Coral gardens', 'Subtidal chalk',
+                            'Seapens and burrowing megafauna communities']},
+        'strip': ['JNCC code'],
+        'keys': [('FOCI', 'Feature of Conservation Importance (FOCI)'), ('SubregionName', 'Bioregion')],
+        'output': 'MCZ_Off_FOCI_Sens_Agg_',
+    },
+    'MCZ_Wales_In_FOCI_Sens_Agg': {
+        'title': 'MCZ Wales inshore FOCI',
+        'strip': ['JNCC code'],
+        'keys': [('FOCI', 'Feature of Conservation Importance (FOCI)'), ('Depth', 'Depth zone')],
+        'output': 'MCZ_Wales_In_FOCI_Sens_Agg_',
+    },
+    'AnxI_EngWales_Off_Sens_Agg': {
+        'title': 'anxI EngWales off sensitivity',
+        'strip': ['EUNIS code', 'SubregionName', 'Annex I habitat', 'Annex I sub-feature'],
+        'keys': [('SubregionName', 'Bioregion'), ('Annex I habitat', 'Annex I Habitat'),
+                 ('Annex I sub-feature', 'Annex I sub-type')],
+        'required': ['Annex I Habitat'],
+        'output': 'AnxI_EngWales_Off_Sens_Agg_',
+    },
+    'AnxI_Scot_Off_Sens_Agg': {
+        'title': 'anxI Scot off sensitivity',
+        'strip': ['EUNIS code', 'SubregionName', 'Annex I habitat', 'Annex I sub-type'],
+        'keys': [('SubregionName', 'Bioregion'), ('Annex I habitat', 'Annex I Habitat'),
+                 ('Annex I sub-type', 'Annex I sub-type')],
+        'required': ['Annex I Habitat'],
+        'output': 'AnxI_Scot_Off_Sens_Agg_',
+    },
+    'MCZ_Wales_In_BSH_Sens_Agg': {
+        'title': 'MCZ Wales Inshore aggregation',
+        'strip': ['JNCC code'],
+        'keys': [('BSH', 'BSH'), ('Depth', 'Depth zone')],
+        'empty': 'Unknown',
+        'output': 'MCZ_Wales_In_BSH_Sens_Agg_',
+    },
+    'PMF_Off_Sens_Agg_ExDepth': {
+        'title': 'PMF sensitivity',
+        'strip': ['JNCC code', 'PMF'],
+        'keys': [('PMF', 'Priority Marine Feature (PMF)'), ('SubregionName', 'Bioregion')],
+        'output': 'PMF_Off_Sens_Agg_',
+    },
+}
+
+# MarESA assessment values which are renamed prior to the aggregation
+ASSESSMENT_NAMES = {
+    'Not relevant (NR)': 'Not relevant',
+    'No evidence (NEv)': 'No evidence',
+    'Not assessed (NA)': 'Not assessed',
+    'Not Assessed (NA)': 'Not assessed',
+}
+
+# Columns of the aggregated output which follow the key columns
+SCORE_COLUMNS = ['AggregatedSensitivity', 'AssessedCount', 'UnassessedCount', 'AggregationConfidenceValue',
+                 'AggregationConfidenceScore']
+
+#############################################################
+
+
+# Function Title: maresa_version
+def maresa_version(marESA_file):
+    """User defined function to return the abbreviated MarESA Extract version (e.g. 'marESA20220420') used within the
+    output file names"""
+    # Remove the file extension, retain the date of creation and remove the hyphens
+    maresa_date = str(marESA_file).split('.')[0]
+    maresa_date = str(maresa_date).split('_')[-1]
+    return 'marESA' + maresa_date.replace('-', '')
+
+
+# Function Title: key_categorical
+def key_categorical(values):
+    """User defined function to return a key column as a categorical of the text of each value, with missing values
+    given the category 'nan' (as when the key values were previously combined into a single string). Only the unique
+    values are converted to text"""
+    codes, uniques = pd.factorize(values)
+    # Missing values have the code -1, which selects the 'nan' text appended to the end of the unique values
+    text = pd.Index([str(value) for value in uniques] + ['nan'])
+    categories = text.unique().sort_values()
+    return pd.Categorical.from_codes(categories.get_indexer(text)[codes], categories)
+
+
+# Function Title: prepare_features
+def prepare_features(features, config):
+    """User defined function to retain the features of interest, strip trailing whitespace prior to merging and hold
+    the key columns as categoricals so that each group is formed from the category codes"""
+    for col, values in config.get('filter', {}).items():
+        features = features[features[col].isin(values)]
+    if 'drop' in config:
+        features = features.drop(config['drop'], axis=1).drop_duplicates()
+    for col in config['strip']:
+        features[col] = features[col].str.strip()
+    for feature_col, output_col in config['keys']:
+        features[feature_col] = key_categorical(features[feature_col])
+    return features
+
+
+# Function Title: prepare_maresa
+def prepare_maresa(MarESA, config):
+    """User defined function to return the first assessment of each habitat and pressure within the MarESA extract
+    (which has not been filled with the missing habitat and pressure combinations). Missing assessment values are
+    filled as 'Unknown' and the acronyms are removed, as for the filled extract"""
+    if 'JNCC code' in config['strip']:
+        MarESA['JNCC_Code'] = MarESA['JNCC_Code'].str.strip()
+    MarESA = MarESA.drop_duplicates(['habitatID', 'Pressure'])
+    MarESA['Sensitivity'] = MarESA['Sensitivity'].fillna('Unknown').replace(ASSESSMENT_NAMES)
+    MarESA['Pressure'] = MarESA['Pressure'].astype('category')
+    return MarESA[['habitatID', 'JNCC_Code', 'NE_Code', 'Pressure', 'Sensitivity']]
+
+
+# Function Title: feature_counts
+def feature_counts(features, MarESA, config):
+    """Count the Sensitivity assessments of each pressure and unique combination of the feature key columns.
+
+    Every biotope without a MarESA assessment for a pressure counts as 'Unknown' - one for each habitat of the JNCC
+    code missing the pressure, and for a JNCC code without any MarESA assessments, one for each unique NE code and
+    pressure. These unknown counts are derived from the number of habitats and assessments of each group, so the
+    'Unknown' rows (the habitat x pressure and feature x pressure cross joins) are never created. Each habitat is
+    expected to have a single JNCC code"""
+    feature_cols = [feature_col for feature_col, output_col in config['keys']]
+    keys = ['Pressure'] + feature_cols
+    categories = SENSITIVITY_CATEGORIES
+    count_cols = [count_col for label, pattern, count_col in categories]
+
+    # Count the MarESA assessments of each group
+    assessments = pd.merge(features[feature_cols + ['JNCC code']], MarESA[['JNCC_Code', 'Pressure', 'Sensitivity']],
+                           left_on='JNCC code', right_on='JNCC_Code')
+    counts = aggregate_assessments(assessments, keys, 'Sensitivity', categories)
+    sizes = assessments.groupby(keys, observed=True).size().rename('Assessments').reset_index()
+    counts = counts.merge(sizes, on=keys)
+
+    # Number of habitats of the JNCC code of each feature, and the number of features without MarESA assessments,
+    # within each unique combination of the key columns
+    habitats = MarESA.drop_duplicates('habitatID')['JNCC_Code'].value_counts(dropna=False)
+    features['Habitats'] = features['JNCC code'].map(habitats).fillna(0).astype('int64').values
+    features['Unassessed'] = (features['Habitats'] == 0).astype('int64')
+    groups = features.groupby(feature_cols, observed=True)[['Habitats', 'Unassessed']].sum().reset_index()
+
+    # Number of unique NE codes of each pressure
+    pressures = MarESA.drop_duplicates(['NE_Code', 'Pressure']).groupby('Pressure').size()
+    pressures = pd.DataFrame({'Pressure': pressures.index, 'NE_Codes': pressures.values})
+
+    # Every pressure is assessed (or unknown) for every combination of the key columns
+    counts = groups.merge(pressures, how='cross').merge(counts, how='left', on=keys)
+    counts[count_cols + ['Assessments']] = counts[count_cols + ['Assessments']].fillna(0).astype('int64')
+    counts['Count_Unknown'] += (counts['Habitats'] - counts['Assessments'] +
+                                counts['Unassessed'] * counts['NE_Codes'])
+
+    counts = presence_columns(counts, categories)
+    counts = counts.sort_values(keys, kind='mergesort', ignore_index=True)
+    return order_columns(counts, keys, categories)
+
+
+# Function Title: aggregate_feature_sensitivity
+def aggregate_feature_sensitivity(agg, config):
+    """User defined function to score the Sensitivity assessment counts of each pressure and unique combination of the
+    feature key columns and return the output columns"""
+    output_cols = [output_col for feature_col, output_col in config['keys']]
+
+    # Score the aggregated assessments
+    categories = SENSITIVITY_CATEGORIES
+    agg['AggregatedSensitivity'] = final_assessment(agg, categories)
+    agg.loc[agg['AggregatedSensitivity'] == '', 'AggregatedSensitivity'] = config.get('empty', '')
+    agg['AssessedCount'] = combine_assessedcounts(agg, categories)
+    agg['UnassessedCount'] = combine_unassessedcounts(agg, categories)
+    agg['AggregationConfidenceValue'] = create_confidence(agg, categories)
+    agg['AggregationConfidenceScore'] = categorise_confidence(agg['AggregationConfidenceValue'])
+
+    # Rename the key columns and rearrange columns correctly into DataFrame schema
+    agg = agg.rename(columns=dict(config['keys']))
+    agg = agg[['Pressure'] + output_cols + SCORE_COLUMNS]
+
+    # Remove the groups which are missing a required key value
+    for col in config.get('required', []):
+        agg = agg[agg[col] != 'nan']
+    return agg
+
+
+# Function Title: aggregate_features
+def aggregate_features(name, marESA_file, feature_file, output_file, inputs=None, output_format='csv'):
+    """Run the feature aggregation of a designation (a FEATURE_AGGREGATIONS entry) and return the output file name.
+
+    e.g. filename = aggregate_features('MCZ_Off_FOCI_Sens_Agg', marESA_file, EnglishOffshore, output_file)"""
+    config = FEATURE_AGGREGATIONS[name]
+
+    # Test the run time of the function
+    start = time.process_time()
+    start_time = time.time()
+    print('Starting the ' + config['title'] + ' script...')
+
+    # Use the input data loaded for this run, or load it if the script is run on its own
+    if inputs is None:
+        inputs = AggregationInputs(marESA_file)
+
+    features = prepare_features(inputs.data_csv(feature_file), config)
+    MarESA = prepare_maresa(inputs.maresa(fill_missing=False), config)
+    agg = aggregate_feature_sensitivity(feature_counts(features, MarESA, config), config)
+
+    # Define folder file path to be saved into and the file name, categorised by date
+    outpath = "./MarESA/Output/" + output_file
+    date = time.strftime("%Y%m%d")
+    filename = config['output'] + date + '_' + maresa_version(marESA_file) + ".csv"
+    # Write the output in the chosen format (CSV by default), replacing the file extension where needed, and record
+    # the output within the run manifest of the output folder
+    run = run_record(config['output'].rstrip('_'), {'maresa': maresa_version(marESA_file)},
+                     [inputs.data_path + marESA_file, inputs.data_path + feature_file], start_time, date)
+    filename = write_output(agg, outpath, filename, output_format, run)
+
+    # Stop the timer post computation and print the elapsed time
+    elapsed = (time.process_time() - start)
+    print('...The ' + str(filename) + ' script took ' + str(round(elapsed / 60, 1)) + ' minutes to run and complete.'
+          + '\n' + 'This has been saved as a time-stamped output at the following filepath: ' + str(outpath) + '\n\n')
+
+    return filename
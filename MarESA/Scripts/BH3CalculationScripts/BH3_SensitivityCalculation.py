@@ -20,15 +20,70 @@
 
 # Import all Python libraries required
 import os
+import sys
 import time
+import numpy as np
 import pandas as pd
 pd.options.mode.chained_assignment = None  # default='warn'
 
+# Add the shared aggregation engine to the path so that this script can also be run on its own
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'AggregationEngine'))
+from AggregationOutput import read_output, write_output
+from AggregationRunManifest import run_record
+
+########################################################################################################################
+
+# BH3 scoring table
+
+# The most precautionary value of an aggregated assessment (e.g. 'Medium, None') is the first of these values found
+# within the assessment, taken in order - each value found is assigned the precautionary category which follows it.
+# NOTE: precautionary values for resilience do not currently account for 'Very High' as this value is not used within
+# JNCC data
+RESISTANCE_PRECAUTION = [('None', 'None'), ('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High'),
+                         ('Not relevant', 'Not relevant'), ('Not assessed', 'Unassessed'),
+                         ('Unknown', 'Unassessed'), ('No evidence', 'Unassessed')]
+RESILIENCE_PRECAUTION = [('Very low', 'Very low'), ('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High'),
+                         ('Not relevant', 'Not relevant'), ('Not assessed', 'Unassessed'),
+                         ('Unknown', 'Unassessed'), ('No evidence', 'Unassessed')]
+
+# BH3 sensitivity score of each precautionary resistance (rows) and resilience (columns) category. Resistance or
+# resilience values which are not relevant score -2 and values which are unassessed score -1.
+BH3_SCORES = pd.DataFrame(
+    [[5, 4, 4, 3, -2, -1],
+     [4, 4, 3, 3, -2, -1],
+     [4, 3, 3, 2, -2, -1],
+     [3, 3, 2, 2, -2, -1],
+     [-2, -2, -2, -2, -2, -1],
+     [-1, -1, -1, -1, -1, -1]],
+    index=['None', 'Low', 'Medium', 'High', 'Not relevant', 'Unassessed'],
+    columns=['Very low', 'Low', 'Medium', 'High', 'Not relevant', 'Unassessed'])
+
+
+# Define function which takes a DF of assessments and returns the position of the most precautionary category of each
+# value within the categories, or -1 where the value holds none of the precautionary values (e.g. a blank value)
+def precautionary_codes(df, precaution, categories):
+    values = pd.Series(df.to_numpy().ravel()).astype(str)
+    conditions = [values.str.contains(value, regex=False).to_numpy() for value, category in precaution]
+    codes = [list(categories).index(category) for value, category in precaution]
+    return np.select(conditions, codes, default=-1).reshape(df.shape)
+
+
+# Define function which returns the BH3 sensitivity score of every resistance and resilience assessment pair, looked up
+# within the BH3_SCORES matrix. Pairs which cannot be scored are returned as NaN.
+def bh3_scores(resistance, resilience):
+    resistance_codes = precautionary_codes(resistance, RESISTANCE_PRECAUTION, BH3_SCORES.index)
+    resilience_codes = precautionary_codes(resilience, RESILIENCE_PRECAUTION, BH3_SCORES.columns)
+    # Add a row and column of NaN to the matrix, which is looked up by the -1 codes
+    scores = np.full((BH3_SCORES.shape[0] + 1, BH3_SCORES.shape[1] + 1), np.nan)
+    scores[:-1, :-1] = BH3_SCORES.to_numpy()
+    return scores[resistance_codes, resilience_codes]
+
 
 # Create function to execute main script
-def main(resistance_file, resilience_file,output_file):
+def main(resistance_file, resilience_file,output_file, output_format='csv'):
 
     start = time.process_time()
+    start_time = time.time()
     print('BH3 sensitivity script started...')
 
     # Import aggregated resistance data
@@ -53,7 +108,8 @@ def main(resistance_file, resilience_file,output_file):
     # edited file
     #resistance_masterframeOFF = pd.read_csv(res_files[0], dtype=str)
 
-    resistance_masterframeOFF = pd.read_csv('./Maresa/Output/' + resistance_file,
+    # The resistance output can be either a CSV or a Parquet output (see AggregationOutput.py)
+    resistance_masterframeOFF = read_output('./Maresa/Output/' + resistance_file,
         dtype=str)
 
     ############################################################
@@ -86,7 +142,7 @@ def main(resistance_file, resilience_file,output_file):
     # edited file
     #resilience_masterframeOFF = pd.read_csv(resil_files[0], dtype=str)
 
-    resilience_masterframeOFF = pd.read_csv('./Maresa/Output/' + resilience_file,
+    resilience_masterframeOFF = read_output('./Maresa/Output/' + resilience_file,
         dtype=str)
 
     ############################################################
@@ -186,1149 +242,20 @@ def main(resistance_file, resilience_file,output_file):
 
     ############################################################
 
-    # Define function which takes a range and returns the most precautionary value
-    def precautionary_value(row, assessment_type, column):
-        # Process the most precautionary value from all resistance scores
-        if assessment_type == 'Resistance':
-            res = str(row[column])
-            if 'None' in res:
-                return 'None'
-            elif 'None' not in res and 'Low' in res:
-                return 'Low'
-            elif 'None' not in res and 'Low' not in res and 'Medium' in res:
-                return 'Medium'
-            elif 'None' not in res and 'Low' not in res and 'Medium' not in res and 'High' in res:
-                return 'High'
-            elif 'None' not in res and 'Low' not in res and 'Medium' not in res and 'High' not in res and \
-                    'Not relevant' in res:
-                return 'Not relevant'
-            elif 'None' not in res and 'Low' not in res and 'Medium' not in res and 'High' not in res and \
-                    'Not relevant' not in res and 'Not assessed' in res:
-                return 'Unassessed'
-            elif 'None' not in res and 'Low' not in res and 'Medium' not in res and 'High' not in res and \
-                    'Not relevant' not in res and 'Not assessed' not in res and 'Unknown' in res:
-                return 'Unassessed'
-            elif 'None' not in res and 'Low' not in res and 'Medium' not in res and 'High' not in res and \
-                    'Not relevant' not in res and 'Not assessed' not in res and 'Unknown' not in res and \
-                    'No evidence' in res:
-                return 'Unassessed'
-
-        # Process the most precautionary value from all resistance scores
-        # NOTE: precautionary values for resilience do not currently account for 'Very High' as this value is not
-        # used within JNCC data
-        elif assessment_type == 'Resilience':
-            resil = str(row[column])
-            if 'Very low' in resil:
-                return 'Very low'
-            elif 'Very low' not in resil and 'Low' in resil:
-                return 'Low'
-            elif 'Very low' not in resil and 'Low' not in resil and 'Medium' in resil:
-                return 'Medium'
-            elif 'Very low' not in resil and 'Low' not in resil and 'Medium' not in resil and 'High' in resil:
-                return 'High'
-            elif 'Very low' not in resil and 'Low' not in resil and 'Medium' not in resil and 'High' not in resil \
-                    and 'Not relevant' in resil:
-                return 'Not relevant'
-            elif 'Very low' not in resil and 'Low' not in resil and 'Medium' not in resil and 'High' not in resil \
-                    and 'Not relevant' not in resil and 'Not assessed' in resil:
-                return 'Unassessed'
-            elif 'Very low' not in resil and 'Low' not in resil and 'Medium' not in resil and 'High' not in resil \
-                    and 'Not relevant' not in resil and 'Not assessed' not in resil and 'Unknown' in resil:
-                return 'Unassessed'
-            elif 'Very low' not in resil and 'Low' not in resil and 'Medium' not in resil and 'High' not in resil \
-                    and 'Not relevant' not in resil and 'Not assessed' not in resil and 'Unknown' not in resil and \
-                    'No evidence' in resil:
-                return 'Unassessed'
-
-# LM: Not in use 09/04/21
-    # # Run precautionary assessment and assign to new column for Resistance assessments L2-L5
-    # # EUNIS L2
-    # res_resil_mergeOFF['L2_ResPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resistance', 'L2_FinalResistance'), axis=1)
-    # # EUNIS L3
-    # res_resil_mergeOFF['L3_ResPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resistance', 'L3_FinalResistance'), axis=1)
-    # # EUNIS L4
-    # res_resil_mergeOFF['L4_ResPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resistance', 'L4_FinalResistance'), axis=1)
-    # # EUNIS L5
-    # res_resil_mergeOFF['L5_ResPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resistance', 'L5_FinalResistance'), axis=1)
-    # # EUNIS L6
-    # res_resil_mergeOFF['L6_ResPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resistance', 'L6_FinalResistance'), axis=1)
-    #
-    # # Run precautionary assessment and assign to new column for Resilience assessments L2-L5
-    # # EUNIS L2
-    # res_resil_mergeOFF['L2_ResilPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resilience', 'L2_FinalResilience'), axis=1)
-    # # EUNIS L3
-    # res_resil_mergeOFF['L3_ResilPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resilience', 'L3_FinalResilience'), axis=1)
-    # # EUNIS L4
-    # res_resil_mergeOFF['L4_ResilPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resilience', 'L4_FinalResilience'), axis=1)
-    # # EUNIS L5
-    # res_resil_mergeOFF['L5_ResilPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resilience', 'L5_FinalResilience'), axis=1)
-    # # EUNIS L6
-    # res_resil_mergeOFF['L6_ResilPrecaution'] = \
-    #     res_resil_mergeOFF.apply(lambda row: precautionary_value(row, 'Resilience', 'L6_FinalResilience'), axis=1)
-
-# LM TO FIX 09/04/21
-
-    # # Define function to iterate through the DF and assign a BH3 sensitivity value based on the resistance and
-    # # resilience score - LM TO FIX NOT CURRENTLY WORKING
-    # def bh3_calc(row, eunislvl):
-    #     # Run calculations for EUNIS level 2 aggregations
-    #     # Load necessary columns into the function
-    #     # EUNIS L2
-    #     L2_ResPrec = str(res_resil_mergeOFF['L2_ResPrecaution'])
-    #     L2_ResilPrec = str(res_resil_mergeOFF['L2_ResilPrecaution'])
-    #     # EUNIS L3
-    #     L3_ResPrec = str(res_resil_mergeOFF['L3_ResPrecaution'])
-    #     L3_ResilPrec = str(res_resil_mergeOFF['L3_ResilPrecaution'])
-    #     # EUNIS L4
-    #     L4_ResPrec = str(res_resil_mergeOFF['L4_ResPrecaution'])
-    #     L4_ResilPrec = str(res_resil_mergeOFF['L4_ResilPrecaution'])
-    #     # EUNIS L5
-    #     L5_ResPrec = str(res_resil_mergeOFF['L5_ResPrecaution'])
-    #     L5_ResilPrec = str(res_resil_mergeOFF['L5_ResilPrecaution'])
-    #     # EUNIS L6
-    #     L6_ResPrec = str(res_resil_mergeOFF['L6_ResPrecaution'])
-    #     L6_ResilPrec = str(res_resil_mergeOFF['L6_ResilPrecaution'])
-    #
-    #     if eunislvl == 2:
-    #         # Conduct calculation if the value is 'None'
-    #         if L2_ResPrec == 'None' and \
-    #                 L2_ResilPrec == 'Very Low':
-    #             return 5
-    #         elif L2_ResPrec == 'None' and \
-    #                 L2_ResilPrec == 'Low':
-    #             return 4
-    #         elif L2_ResPrec == 'None' and \
-    #                 L2_ResilPrec == 'Medium':
-    #             return 4
-    #         elif L2_ResPrec == 'None' and \
-    #                 L2_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the value is 'Low'
-    #         elif L2_ResPrec == 'Low' and \
-    #                 L2_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L2_ResPrec == 'Low' and \
-    #                 L2_ResilPrec == 'Low':
-    #             return 4
-    #         elif L2_ResPrec == 'Low' and \
-    #                 L2_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L2_ResPrec == 'Low' and \
-    #                 L2_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the value is 'Medium'
-    #         elif L2_ResPrec == 'Medium' and \
-    #                 L2_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L2_ResPrec == 'Medium' and \
-    #                 L2_ResilPrec == 'Low':
-    #             return 3
-    #         elif L2_ResPrec == 'Medium' and \
-    #                 L2_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L2_ResPrec == 'Medium' and \
-    #                 L2_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the value is 'High'
-    #         elif L2_ResPrec == 'High' and \
-    #                 L2_ResilPrec == 'Very Low':
-    #             return 3
-    #         elif L2_ResPrec == 'High' and \
-    #                 L2_ResilPrec == 'Low':
-    #             return 3
-    #         elif L2_ResPrec == 'High' and \
-    #                 L2_ResilPrec == 'Medium':
-    #             return 2
-    #         elif L2_ResPrec == 'High' and \
-    #                 L2_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the value is 'Not relevant'
-    #         elif L2_ResPrec == 'Not relevant' and \
-    #                 L2_ResilPrec == 'Not relevant':
-    #             return -2
-    #
-    #         # Conduct calculation if the value is 'Not assessed'
-    #         elif L2_ResPrec == 'Not assessed' and \
-    #                 L2_ResilPrec == 'Not assessed':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'No evidence'
-    #         elif L2_ResPrec == 'Not evidence' and \
-    #                 L2_ResilPrec == 'Not evidence':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'Unknown'
-    #         elif L2_ResPrec == 'Unknown' and \
-    #                 L2_ResilPrec == 'Unknown':
-    #             return -1
-    #
-    #     # Run calculations for EUNIS level 3 aggregations
-    #     elif eunislvl == 3:
-    #         # Conduct calculation if the resistance value is 'None'
-    #         if L3_ResPrec == 'None' and \
-    #                 L3_ResilPrec == 'Very Low':
-    #             return 5
-    #         elif L3_ResPrec == 'None' and \
-    #                 L3_ResilPrec == 'Low':
-    #             return 4
-    #         elif L3_ResPrec == 'None' and \
-    #                 L3_ResilPrec == 'Medium':
-    #             return 4
-    #         elif L3_ResPrec == 'None' and \
-    #                 L3_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Low'
-    #         elif L3_ResPrec == 'Low' and \
-    #                 L3_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L3_ResPrec == 'Low' and \
-    #                 L3_ResilPrec == 'Low':
-    #             return 4
-    #         elif L3_ResPrec == 'Low' and \
-    #                 L3_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L3_ResPrec == 'Low' and \
-    #                 L3_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Medium'
-    #         elif L3_ResPrec == 'Medium' and \
-    #                 L3_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L3_ResPrec == 'Medium' and \
-    #                 L3_ResilPrec == 'Low':
-    #             return 3
-    #         elif L3_ResPrec == 'Medium' and \
-    #                 L3_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L3_ResPrec == 'Medium' and \
-    #                 L3_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the resistance value is 'High'
-    #         elif L3_ResPrec == 'High' and \
-    #                 L3_ResilPrec == 'Very Low':
-    #             return 3
-    #         elif L3_ResPrec == 'High' and \
-    #                 L3_ResilPrec == 'Low':
-    #             return 3
-    #         elif L3_ResPrec == 'High' and \
-    #                 L3_ResilPrec == 'Medium':
-    #             return 2
-    #         elif L3_ResPrec == 'High' and \
-    #                 L3_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the value is 'Not relevant'
-    #         elif L3_ResPrec == 'Not relevant' and \
-    #                 L3_ResilPrec == 'Not relevant':
-    #             return -2
-    #
-    #         # Conduct calculation if the value is 'Not assessed'
-    #         elif L3_ResPrec == 'Not assessed' and \
-    #                 L3_ResilPrec == 'Not assessed':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'No evidence'
-    #         elif L3_ResPrec == 'Not evidence' and \
-    #                 L3_ResilPrec == 'Not evidence':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'Unknown'
-    #         elif L3_ResPrec == 'Unknown' and \
-    #                 L3_ResilPrec == 'Unknown':
-    #             return -1
-    #
-    #     # Run calculations for EUNIS level 4 aggregations
-    #     elif eunislvl == 4:
-    #         # Conduct calculation if the resistance value is 'None'
-    #         if L4_ResPrec == 'None' and \
-    #                 L4_ResilPrec == 'Very Low':
-    #             return 5
-    #         elif L4_ResPrec == 'None' and \
-    #                 L4_ResilPrec == 'Low':
-    #             return 4
-    #         elif L4_ResPrec == 'None' and \
-    #                 L4_ResilPrec == 'Medium':
-    #             return 4
-    #         elif L4_ResPrec == 'None' and \
-    #                 L4_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Low'
-    #         elif L4_ResPrec == 'Low' and \
-    #                 L4_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L4_ResPrec == 'Low' and \
-    #                 L4_ResilPrec == 'Low':
-    #             return 4
-    #         elif L4_ResPrec == 'Low' and \
-    #                 L4_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L4_ResPrec == 'Low' and \
-    #                 L4_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Medium'
-    #         elif L4_ResPrec == 'Medium' and \
-    #                 L4_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L4_ResPrec == 'Medium' and \
-    #                 L4_ResilPrec == 'Low':
-    #             return 3
-    #         elif L4_ResPrec == 'Medium' and \
-    #                 L4_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L4_ResPrec == 'Medium' and \
-    #                 L4_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the resistance value is 'High'
-    #         elif L4_ResPrec == 'High' and \
-    #                 L4_ResilPrec == 'Very Low':
-    #             return 3
-    #         elif L4_ResPrec == 'High' and \
-    #                 L4_ResilPrec == 'Low':
-    #             return 3
-    #         elif L4_ResPrec == 'High' and \
-    #                 L4_ResilPrec == 'Medium':
-    #             return 2
-    #         elif L4_ResPrec == 'High' and \
-    #                 L4_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the value is 'Not relevant'
-    #         elif L4_ResPrec == 'Not relevant' and \
-    #                 L4_ResilPrec == 'Not relevant':
-    #             return -2
-    #
-    #         # Conduct calculation if the value is 'Not assessed'
-    #         elif L4_ResPrec == 'Not assessed' and \
-    #                 L4_ResilPrec == 'Not assessed':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'No evidence'
-    #         elif L4_ResPrec == 'Not evidence' and \
-    #                 L4_ResilPrec == 'Not evidence':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'Unknown'
-    #         elif L4_ResPrec == 'Unknown' and \
-    #                 L4_ResilPrec == 'Unknown':
-    #             return -1
-    #
-    #     # Run calculations for EUNIS level 5 aggregations
-    #     elif eunislvl == 5:
-    #         # Conduct calculation if the resistance value is 'None'
-    #         if L5_ResPrec == 'None' and \
-    #                 L5_ResilPrec == 'Very Low':
-    #             return 5
-    #         elif L5_ResPrec == 'None' and \
-    #                 L5_ResilPrec == 'Low':
-    #             return 4
-    #         elif L5_ResPrec == 'None' and \
-    #                 L5_ResilPrec == 'Medium':
-    #             return 4
-    #         elif L5_ResPrec == 'None' and \
-    #                 L5_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Low'
-    #         elif L5_ResPrec == 'Low' and \
-    #                 L5_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L5_ResPrec == 'Low' and \
-    #                 L5_ResilPrec == 'Low':
-    #             return 4
-    #         elif L5_ResPrec == 'Low' and \
-    #                 L5_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L5_ResPrec == 'Low' and \
-    #                 L5_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Medium'
-    #         elif L5_ResPrec == 'Medium' and \
-    #                 L5_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L5_ResPrec == 'Medium' and \
-    #                 L5_ResilPrec == 'Low':
-    #             return 3
-    #         elif L5_ResPrec == 'Medium' and \
-    #                 L5_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L5_ResPrec == 'Medium' and \
-    #                 L5_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the resistance value is 'High'
-    #         elif L5_ResPrec == 'High' and \
-    #                 L5_ResilPrec == 'Very Low':
-    #             return 3
-    #         elif L5_ResPrec == 'High' and \
-    #                 L5_ResilPrec == 'Low':
-    #             return 3
-    #         elif L5_ResPrec == 'High' and \
-    #                 L5_ResilPrec == 'Medium':
-    #             return 2
-    #         elif L5_ResPrec == 'High' and \
-    #                 L5_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the value is 'Not relevant'
-    #         elif L5_ResPrec == 'Not relevant' and \
-    #                 L5_ResilPrec == 'Not relevant':
-    #             return -2
-    #
-    #         # Conduct calculation if the value is 'Not assessed'
-    #         elif L5_ResPrec == 'Not assessed' and \
-    #                 L5_ResilPrec == 'Not assessed':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'No evidence'
-    #         elif L5_ResPrec == 'Not evidence' and \
-    #                 L5_ResilPrec == 'Not evidence':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'Unknown'
-    #         elif L5_ResPrec == 'Unknown' and \
-    #                 L5_ResilPrec == 'Unknown':
-    #             return -1
-    #
-    #     # Run calculations for EUNIS level 6 aggregations
-    #     elif eunislvl == 6:
-    #         # Conduct calculation if the resistance value is 'None'
-    #         if L6_ResPrec == 'None' and \
-    #                 L6_ResilPrec == 'Very Low':
-    #             return 5
-    #         elif L6_ResPrec == 'None' and \
-    #                 L6_ResilPrec == 'Low':
-    #             return 4
-    #         elif L6_ResPrec == 'None' and \
-    #                 L6_ResilPrec == 'Medium':
-    #             return 4
-    #         elif L6_ResPrec == 'None' and \
-    #                 L6_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Low'
-    #         elif L6_ResPrec == 'Low' and \
-    #                 L6_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L6_ResPrec == 'Low' and \
-    #                 L6_ResilPrec == 'Low':
-    #             return 4
-    #         elif L6_ResPrec == 'Low' and \
-    #                 L6_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L6_ResPrec == 'Low' and \
-    #                 L6_ResilPrec == 'High':
-    #             return 3
-    #
-    #         # Conduct calculation if the resistance value is 'Medium'
-    #         elif L6_ResPrec == 'Medium' and \
-    #                 L6_ResilPrec == 'Very Low':
-    #             return 4
-    #         elif L6_ResPrec == 'Medium' and \
-    #                 L6_ResilPrec == 'Low':
-    #             return 3
-    #         elif L6_ResPrec == 'Medium' and \
-    #                 L6_ResilPrec == 'Medium':
-    #             return 3
-    #         elif L6_ResPrec == 'Medium' and \
-    #                 L6_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the resistance value is 'High'
-    #         elif L6_ResPrec == 'High' and \
-    #                 L6_ResilPrec == 'Very Low':
-    #             return 3
-    #         elif L6_ResPrec == 'High' and \
-    #                 L6_ResilPrec == 'Low':
-    #             return 3
-    #         elif L6_ResPrec == 'High' and \
-    #                 L6_ResilPrec == 'Medium':
-    #             return 2
-    #         elif L6_ResPrec == 'High' and \
-    #                 L6_ResilPrec == 'High':
-    #             return 2
-    #
-    #         # Conduct calculation if the value is 'Not relevant'
-    #         elif L6_ResPrec == 'Not relevant' and \
-    #                 L6_ResilPrec == 'Not relevant':
-    #             return -2
-    #
-    #         # Conduct calculation if the value is 'Not assessed'
-    #         elif L6_ResPrec == 'Not assessed' and \
-    #                 L6_ResilPrec == 'Not assessed':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'No evidence'
-    #         elif L6_ResPrec == 'Not evidence' and \
-    #                 L6_ResilPrec == 'Not evidence':
-    #             return -1
-    #
-    #         # Conduct calculation if the value is 'Unknown'
-    #         elif L6_ResPrec == 'Unknown' and \
-    #                 L6_ResilPrec == 'Unknown':
-    #             return -1
-
-
-    # Use lambda calculus to apply the bh3_calc function to all rows of the res_resil_merge DF and assign the
-    # resulting value to the new 'BH3_L2' column
-
-    def bh3_calc(row, eunislvl):
-        # Run calculations for EUNIS level 2 aggregations
-        # Load necessary columns into the function
-
-        if eunislvl == 2:
-            # Conduct calculation if the Resistance value is 'None'
-            if precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Very low':
-                return 5
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Medium':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Low'
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Medium'
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'High'
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Very low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Medium':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Not relevant'
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Very low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Medium':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'High':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Unassessed'
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Very low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Medium':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'High':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Not relevant':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L2_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L2_FinalResilience') == 'Unassessed':
-                return -1
-
-
-        # Run calculations for EUNIS level 3 aggregations
-        elif eunislvl == 3:
-            # Conduct calculation if the resistance value is 'None'
-            if precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Very low':
-                return 5
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Medium':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Low'
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Medium'
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'High'
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Very low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Medium':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Not relevant'
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Very low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Medium':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'High':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Unassessed'
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Very low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Medium':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'High':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Not relevant':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L3_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L3_FinalResilience') == 'Unassessed':
-                return -1
-
-        # Run calculations for EUNIS level 4 aggregations
-        elif eunislvl == 4:
-            # Conduct calculation if the resistance value is 'None'
-            if precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Very low':
-                return 5
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Medium':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Low'
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Medium'
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'High'
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Very low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Medium':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Not relevant'
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Very low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Medium':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'High':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Unassessed'
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Very low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Medium':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'High':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Not relevant':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L4_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L4_FinalResilience') == 'Unassessed':
-                return -1
-
-        # Run calculations for EUNIS level 5 aggregations
-        elif eunislvl == 5:
-            # Conduct calculation if the resistance value is 'None'
-            if precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Very low':
-                return 5
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Medium':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Low'
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Medium'
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'High'
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Very low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Medium':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Not relevant'
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Very low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Medium':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'High':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Unassessed'
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Very low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Medium':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'High':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Not relevant':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L5_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L5_FinalResilience') == 'Unassessed':
-                return -1
-
-        # Run calculations for EUNIS level 6 aggregations
-        elif eunislvl == 6:
-            # Conduct calculation if the resistance value is 'None'
-            if precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Very low':
-                return 5
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Medium':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'None' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Low'
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'High':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Low' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'Medium'
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Very low':
-                return 4
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Medium':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Medium' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the resistance value is 'High'
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Very low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Low':
-                return 3
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Medium':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'High':
-                return 2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'High' and \
-                    precautionary_value(row, 'Resilience', 'L62_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Not relevant'
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Very low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Low':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Medium':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'High':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Not relevant':
-                return -2
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Not relevant' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Unassessed':
-                return -1
-
-            # Conduct calculation if the Resistance value is 'Unassessed'
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Very low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Low':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Medium':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'High':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Not relevant':
-                return -1
-            elif precautionary_value(row, 'Resistance', 'L6_FinalResistance') == 'Unassessed' and \
-                    precautionary_value(row, 'Resilience', 'L6_FinalResilience') == 'Unassessed':
-                return -1
-
-    res_resil_mergeOFF['BH3_L2'] = res_resil_mergeOFF.apply(lambda row: bh3_calc(row, 2), axis=1)
-
-    # Use lambda calculus to apply the bh3_calc function to all rows of the res_resil_merge DF and assign the
-    # resulting value to the new 'BH3_L3' column
-    res_resil_mergeOFF['BH3_L3'] = res_resil_mergeOFF.apply(lambda row: bh3_calc(row, 3), axis=1)
-
-    # Use lambda calculus to apply the bh3_calc function to all rows of the res_resil_merge DF and assign the
-    # resulting value to the new 'BH3_L4' column
-    res_resil_mergeOFF['BH3_L4'] = res_resil_mergeOFF.apply(lambda row: bh3_calc(row, 4), axis=1)
-
-    # Use lambda calculus to apply the bh3_calc function to all rows of the res_resil_merge DF and assign the
-    # resulting value to the new 'BH3_L5' column
-    res_resil_mergeOFF['BH3_L5'] = res_resil_mergeOFF.apply(lambda row: bh3_calc(row, 5), axis=1)
-
-    # Use lambda calculus to apply the bh3_calc function to all rows of the res_resil_merge DF and assign the
-    # resulting value to the new 'BH3_L5' column
-    res_resil_mergeOFF['BH3_L6'] = res_resil_mergeOFF.apply(lambda row: bh3_calc(row, 6), axis=1)
-
-    # Fill all blank / na values with 'Cannot complete BH3 calculation'
-    res_resil_mergeOFF['BH3_L2'].fillna('Cannot complete BH3 calculation', inplace=True)
-    res_resil_mergeOFF['BH3_L3'].fillna('Cannot complete BH3 calculation', inplace=True)
-    res_resil_mergeOFF['BH3_L4'].fillna('Cannot complete BH3 calculation', inplace=True)
-    res_resil_mergeOFF['BH3_L5'].fillna('Cannot complete BH3 calculation', inplace=True)
-    res_resil_mergeOFF['BH3_L6'].fillna('Cannot complete BH3 calculation', inplace=True)
+    # Assign each resistance and resilience assessment (for EUNIS levels 2 to 6 at once) its most precautionary
+    # value, and look up the BH3 sensitivity score of each resistance / resilience pair within the BH3_SCORES matrix
+    levels = [2, 3, 4, 5, 6]
+    bh3 = bh3_scores(res_resil_mergeOFF[['L' + str(lvl) + '_FinalResistance' for lvl in levels]],
+                     res_resil_mergeOFF[['L' + str(lvl) + '_FinalResilience' for lvl in levels]])
+
+    # Assign the scores to the new 'BH3_L2' to 'BH3_L6' columns and fill all blank / na values with 'Cannot complete
+    # BH3 calculation'
+    for i, lvl in enumerate(levels):
+        bh3_lvl = pd.Series(bh3[:, i], index=res_resil_mergeOFF.index)
+        if bh3_lvl.notnull().all():
+            # Every score is a whole number when all rows could be calculated
+            bh3_lvl = bh3_lvl.astype(int)
+        res_resil_mergeOFF['BH3_L' + str(lvl)] = bh3_lvl.fillna('Cannot complete BH3 calculation')
 
     # Rearrange the merged DF to represent a coherent schema and structure
     res_resil_mergeOFF = res_resil_mergeOFF[[
@@ -1345,10 +272,14 @@ def main(resistance_file, resilience_file,output_file):
     # Define folder file path to be saved into
     outpath = "./MarESA/Output/"+output_file
     # Define file name to save, categorised by date
-    filename = "BH3_OffSens_" + (time.strftime("%Y%m%d") + '_' + str(res_version) + '_'
+    date = time.strftime("%Y%m%d")
+    filename = "BH3_OffSens_" + (date + '_' + str(res_version) + '_'
                                                          + str(resil_version) + ".csv")
-    # Run the output DF.to_csv method
-    res_resil_mergeOFF.to_csv(outpath + filename, sep=',')
+    # Write the output in the chosen format (CSV by default), replacing the file extension where needed, and record
+    # the output within the run manifest of the output folder
+    run = run_record('BH3_OffSens', {'resistance': res_version, 'resilience': resil_version},
+                     ['./Maresa/Output/' + resistance_file, './Maresa/Output/' + resilience_file], start_time, date)
+    filename = write_output(res_resil_mergeOFF, outpath, filename, output_format, run)
 
     ####################################################################################################################
 
@@ -1359,6 +290,8 @@ def main(resistance_file, resilience_file,output_file):
     # round value to 1 decimal place.
     print("...The 'BH3_SensitivityCalculation Offshore' script took " + str(
         round(elapsed / 60, 1)) + ' minutes to run and complete.' + '\n' +
-        'These have been saved as .CSV outputs at the following filepath: ' +
+        'These have been saved as ' + str(output_format).upper() + ' outputs at the following filepath: ' +
         str(outpath) + '\n\n')
 
+    return filename
+
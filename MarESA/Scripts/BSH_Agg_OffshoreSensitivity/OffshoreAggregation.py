@@ -0,0 +1,336 @@
+########################################################################################################################
+
+# Title: JNCC MarESA Offshore Aggregation (EUNIS)
+
+# Authors: Matear, L.(2019)                                                           Email: marinepressures@jncc.gov.uk
+# Version Control: 1.0
+
+# Script description:    Aggregate MarESA sensitivity, resistance and resilience assessments for UK offshore biotopes
+#                        on spatial location and habitat classification system. The MarESA and bioregions data are
+#                        prepared once and each assessment is then passed through the shared roll-up within the
+#                        AggregationEngine folder. For full detail of the methods used, please see:
+#                        https://hub.jncc.gov.uk/assets/faa8722e-865d-4d9f-ab0b-15a2eaa77db0
+
+#                        For any enquiries please contact marinepressures@jncc.gov.uk
+
+########################################################################################################################
+
+# Import all Python libraries required
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+pd.options.mode.chained_assignment = None  # default='warn'
+
+# Add the shared aggregation engine to the path so that this script can also be run on its own
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'AggregationEngine'))
+from AggregationCounts import SENSITIVITY_CATEGORIES, RESISTANCE_CATEGORIES, RESILIENCE_CATEGORIES
+from AggregationHierarchy import LEVEL_COLUMNS, eunis_levels
+from AggregationInputs import AggregationInputs
+from AggregationOutput import write_chunks
+from AggregationRollUp import masterframe_chunks, roll_up, roll_up_partitioned
+from AggregationRunManifest import run_record
+
+#############################################################
+
+# Settings for each offshore aggregation:
+#   categories - the assessment vocabulary counted at each EUNIS level
+#   replace - values replaced within the assessment column before aggregation
+#   prefix - the start of the output file name
+#   fixups - whether the A2.611 / B3 / A6 MasterFrame fixes are applied (these are not applied to resistance)
+OFFSHORE_ASSESSMENTS = {
+    'Sensitivity': {
+        'categories': SENSITIVITY_CATEGORIES,
+        'replace': {"Not relevant (NR)": "Not relevant", "No evidence (NEv)": "No evidence",
+                    "Not assessed (NA)": "Not assessed"},
+        'prefix': 'OffshoreSensAgg_',
+        'fixups': True
+    },
+    'Resistance': {
+        'categories': RESISTANCE_CATEGORIES,
+        'replace': {"Not relevant (NR)": "Not relevant", "No evidence (NEv)": "No evidence",
+                    "Not assessed (NA)": "Not assessed", "Not Assessed (NA)": "Not assessed"},
+        'prefix': 'OffshoreResAgg_',
+        'fixups': False
+    },
+    'Resilience': {
+        'categories': RESILIENCE_CATEGORIES,
+        # De-capitalise the low in all 'Very Low' Resilience scores to enable for differentiation between Low and vLow
+        'replace': {"Not relevant (NR)": "Not relevant", "No evidence (NEv)": "No evidence",
+                    "Not assessed (NA)": "Not assessed", "Very Low": "Very low"},
+        'prefix': 'OffshoreResilAgg_',
+        'fixups': True
+    }
+}
+
+#############################################################
+
+
+# Function Title: df_crossjoin
+def df_crossjoin(df1, df2):
+    """
+    Make a cross join (cartesian product) between two dataframes by using a constant temporary key.
+    Also sets a MultiIndex which is the cartesian product of the indices of the input dataframes.
+    :param df1 dataframe 1
+    :param df1 dataframe 2
+
+    :return cross join of df1 and df2
+    """
+    df1.loc[:, '_tmpkey'] = 1
+    df2.loc[:, '_tmpkey'] = 1
+
+    res = pd.merge(df1, df2, on='_tmpkey').drop('_tmpkey', axis=1)
+    res.index = pd.MultiIndex.from_product((df1.index, df2.index))
+
+    df1.drop('_tmpkey', axis=1, inplace=True)
+    df2.drop('_tmpkey', axis=1, inplace=True)
+
+    return res
+
+
+# Function Title: file_version
+def file_version(file_name):
+    """User defined function to return the date of creation held at the end of an input file name"""
+    # Re-split the string to remove the file extension, then only retain the date of creation
+    return str(str(file_name).split('.')[0]).split('_')[-1]
+
+
+# Function Title: prepare_offshore_data
+def prepare_offshore_data(marESA_file, bioregions_ext, inputs=None):
+    """Prepare the MarESA extract, the JNCC Correlation Table and the bioregions extract for the offshore aggregations.
+    Returns the merged bioregions / MarESA DataFrame with the EUNIS level columns added, together with the bioregions
+    and MarESA versions used within the output file names"""
+    # Use the input data loaded for this run, or load it if the script is run on its own
+    if inputs is None:
+        inputs = AggregationInputs(marESA_file, bioregions_ext)
+
+    ####################################################################################################################
+
+    # A. MarESA Preparation: Unknowns Automation
+
+    # Import the JNCC Correlation Table as Pandas DataFrames - updated with CorrelationTable_C16042020
+    CorrelationTable = inputs.correlation_table()
+
+    # Import all data within the MarESA extract as Pandas DataFrame, with the temporary EUNIS Codes removed as these
+    # are duplicates of existing EUNIS 2008 codes (OG 07/02/2023) and all missing habitat / pressure combinations
+    # filled as 'Unknown'
+    # NOTE: This must be updated each time a new MarESA Extract is released
+    # The top copy of the MarESA Extract can be found at the following file path:
+    # \\jncc-corpfile\gis\Reference\Marine\Sensitivity
+    MarESA = inputs.maresa(remove_temporary=True)
+
+    # Subset data set to only comprise values where the listed biotopes value is not recorded as False or 'nan'
+    CorrelationTable = CorrelationTable.loc[~CorrelationTable['UK Habitat'].isin(['False'])]
+    CorrelationTable = CorrelationTable.loc[~CorrelationTable['UK Habitat'].isin(['nan'])]
+
+    # Drop any unknown values from the CorrelationTable DF
+    CorrelationTable.dropna(subset=['UK Habitat'], inplace=True)
+
+    # Subset data set to exclude any EUNIS level 1, 2 and 3 data as these do not have associated sensitivity
+    # assessments
+    CorrelationTable = CorrelationTable.loc[~CorrelationTable['EUNIS level'].isin(['1', '2', '3'])]
+
+    # Adding a EUNIS level column to the DF based on the 'EUNIS_Code' column - taken from the EUNIS hierarchy table
+    hierarchy = inputs.eunis_hierarchy()
+    MarESA['EUNIS level'] = eunis_levels(MarESA['EUNIS_Code'], hierarchy)['EUNIS_Level']
+
+    # Subset data set to exclude any EUNIS level 1, 2 and 3 data as these do not have associated sensitivity
+    # assessments
+    MarESA = MarESA.loc[~MarESA['EUNIS level'].isin(['1', '2', '3'])]
+
+    # Create a list of all unique EUNIS codes which are present within the CorrelationTableDF, but not the MarESA DF
+    EUNIS_Difference = list(set(CorrelationTable['EUNIS code 2007'].unique()) - set(MarESA['EUNIS_Code'].unique()))
+
+    # Sub-setting the CorrelationTable to only include the EUNIS codes identified within the EUNIS_Difference list
+    CorrelationTable_Subset = CorrelationTable.loc[CorrelationTable['EUNIS code 2007'].isin(EUNIS_Difference)]
+
+    # Renaming the columns within the CorrelationTable_Subset DF to match the relevant MarESA columns
+    CorrelationTable_Subset.rename(columns={'EUNIS code 2007': 'EUNIS_Code', 'EUNIS name 2007': 'JNCC_Name',
+                                            'JNCC 15.03 code': 'JNCC_Code'}, inplace=True)
+
+    # Create subset of all unique pressures and NE codes to be used for the append. Set all assessment values to
+    # 'Unknown' and the habitat values to 'Not a Number' / nan values
+    PressuresCodes = MarESA.drop_duplicates(subset=['NE_Code', 'Pressure'], inplace=False)
+    for unknown_col in ['Resistance', 'ResistanceQoE', 'ResistanceAoE', 'ResistanceDoE', 'Resilience',
+                        'ResilienceQoE', 'ResilienceAoE', 'resilienceDoE', 'Sensitivity', 'SensitivityQoE',
+                        'SensitivityAoE', 'SensitivityDoE']:
+        PressuresCodes.loc[:, unknown_col] = 'Unknown'
+    for nan_col in ['EUNIS_Code', 'Name', 'JNCC_Name', 'JNCC_Code', 'EUNIS level']:
+        PressuresCodes.loc[:, nan_col] = np.nan
+
+    # Create snippet of the correlation table including only the unique biotope codes which do not exist in the MarESA
+    # data
+    correlation_snippet = CorrelationTable_Subset.loc[
+        CorrelationTable_Subset['EUNIS_Code'].isin(list(CorrelationTable['EUNIS code 2007'].unique()))]
+
+    # Remove unwanted erroneous biotope codes from the correlation_snippet data
+    correlation_snippet = correlation_snippet[~correlation_snippet.EUNIS_Code.isin([
+        'LS.LMp.Sm.SM16._', 'LS.LMp.Sm.SM13._', 'LS.LMp.Sm_', 'SS.SCS.SCSVS', 'Saltmarsh 5 EUNIS types Sm:',
+        '104 EUNIS level 5 and 6 types 26 NVC types:'])]
+
+    # Perform cross join to blanket all pressures with unknown values to all EUNIS codes within the correlation_snippet
+    correlation_snippet_template = df_crossjoin(correlation_snippet, PressuresCodes)
+
+    # Drop unwanted columns from the correlation_snippet_template data
+    correlation_snippet_template.drop(['JNCC_Code_y', 'JNCC_Name_y', 'EUNIS_Code_y', 'EUNIS level_y'], axis=1,
+                                      inplace=True)
+
+    # Rename columns to match MarESA data
+    correlation_snippet_template.rename(columns={'EUNIS_Code_x': 'EUNIS_Code', 'EUNIS level_x': 'EUNIS level',
+                                                 'JNCC_Code_x': 'JNCC_Code', 'JNCC_Name_x': 'JNCC_Name'}, inplace=True)
+
+    # Order columns to match MarESA data
+    correlation_snippet_template = correlation_snippet_template[[
+        'JNCC_Code', 'JNCC_Name', 'EUNIS_Code', 'Name',
+        'NE_Code', 'Pressure', 'Resistance', 'ResistanceQoE',
+        'ResistanceAoE', 'ResistanceDoE', 'Resilience',
+        'ResilienceQoE', 'ResilienceAoE', 'resilienceDoE',
+        'Sensitivity', 'SensitivityQoE', 'SensitivityAoE',
+        'SensitivityDoE', 'url', 'EUNIS level'
+        ]]
+
+    # Append the correlation_snippet_template into the MarESA data to have a MarESA dataset which accounts for
+    # 'unknown' values.
+    maresa = MarESA.append(correlation_snippet_template, ignore_index=True)
+
+    ####################################################################################################################
+
+    # B. Bioregions data
+
+    # Define the bioregions object containing the updated outputs from the Bioregions 2017 Contract
+    bioregions = inputs.bioregions()
+
+    # Create abbreviated versions of the bioregions and MarESA file names with the date (hyphens removed) - these are
+    # entered into the aggregation output file name for QC purposes.
+    bioreg_version = 'Bioreg' + file_version(bioregions_ext)
+    maresa_version = 'marESA' + file_version(marESA_file).replace('-', '')
+
+    # Develop a subset of the bioregions data which only contains EUNIS codes of string length 4 or greater
+    # This will remove any unwanted EUNIS L1 - L3 from the data
+    bioregions['HabitatCode'] = bioregions['HabitatCode'].astype(str)
+    bioregions = bioregions[bioregions['HabitatCode'].map(len) >= 5]
+
+    # Following contact between Pressures & Impacts / Mapping Team staff, the biotopes A6.95 and A6.9111 were identified
+    # to be erroneous. Therefore, this data are required to be removed from the input data.
+    maresa = maresa[~maresa.EUNIS_Code.isin(['A6.95', 'A6.9111'])]
+    bioregions = bioregions[~bioregions.HabitatCode.isin(['A6.95', 'A6.9111'])]
+
+    ####################################################################################################################
+
+    # C. Data formatting
+
+    # Rename bioregions column to facilitate merge
+    bioregions.rename(columns={'HabitatCode': 'EUNIS_Code'}, inplace=True)
+
+    # Merge bioregions and marESA data together
+    bioreg_maresa_merge = pd.merge(bioregions, maresa, on='EUNIS_Code')
+
+    # Refine the DF to remove the currently not needed Region 8 (deep sea)
+    bioreg_maresa_merge = bioreg_maresa_merge[bioreg_maresa_merge['SubregionName'] != 'Region 8 (deep-sea)']
+
+    # Refine dataset to only include data for which BiotopePresence == 'Poss' or 'Yes'
+    bioreg_maresa_merge = bioreg_maresa_merge[~bioreg_maresa_merge['BiotopePresence'].isin(['Inshore only', 'No'])]
+
+    # Create individual EUNIS level columns and the 'EUNIS_Level' column (the numerical value of the EUNIS level) in
+    # bioreg_maresa_merge by looking up the 'EUNIS_Code' column within the EUNIS hierarchy table
+    levels = eunis_levels(bioreg_maresa_merge['EUNIS_Code'], hierarchy)
+    bioreg_maresa_merge[LEVEL_COLUMNS] = levels[LEVEL_COLUMNS]
+    bioreg_maresa_merge['EUNIS_Level'] = levels['EUNIS_Level']
+
+    return bioreg_maresa_merge, bioreg_version, maresa_version
+
+
+# Function Title: clean_assessment
+def clean_assessment(bioreg_maresa_merge, assessment):
+    """User defined function to return the assessment column with the acronyms removed from the assessment values
+    and NaN values filled with empty string values"""
+    settings = OFFSHORE_ASSESSMENTS[assessment]
+    return bioreg_maresa_merge[assessment].replace(settings['replace']).fillna('')
+
+
+# Function Title: masterframe_fixups
+def masterframe_fixups(MasterFrame, assessment):
+    """User defined function to apply the fixes for erroneous biotopes to the MasterFrame"""
+    # All 'A2.611' values within the Level_5 column were found to be erroneous and need to be replaced with the string
+    # value of 'Not Applicable'
+    MasterFrame.loc[MasterFrame['Level_5'] == 'A2.611', 'L5_Final' + assessment] = 'Not Applicable'
+
+    # All 'B3' values within the Level_2 column were found to be erroneous and need to be replaced with the string value
+    # of 'Not Applicable'
+    MasterFrame.loc[MasterFrame['Level_2'] == 'B3', 'L2_Final' + assessment] = 'Not Applicable'
+
+    # Remove all A6 biotopes from the MasterFrame (temporary fix 01/07/2020)
+    return MasterFrame[MasterFrame.Level_2 != 'A6']
+
+
+# Define the code as a function to be executed as necessary
+def main(marESA_file, bioregions_ext, output_file, assessments=('Sensitivity', 'Resistance', 'Resilience'),
+         inputs=None, output_format='csv', partition='Pressure', processes=1, split_by=('Pressure',)):
+    """Run the offshore aggregation for each of the listed assessments from a single preparation of the input data.
+    Returns a dictionary of the output file name of each assessment.
+
+    output_format - 'csv', 'csv.gz', 'csv.zst', 'parquet' or 'parquet-partitioned' (see AggregationOutput.py)
+    partition - column by which the 'parquet-partitioned' output is split into files ('Pressure' or 'SubregionName')
+    processes - number of worker processes the roll-up of each assessment is run on, with the data split by the
+    split_by columns ('Pressure', or 'Pressure' and 'SubregionName'). The output is the same for any number of
+    processes. Use 1 to run the roll-up on the whole data within the current process"""
+    # Test the run time of the function
+    start = time.process_time()
+    print('Offshore ' + ', '.join(assessments).lower() + ' aggregation script started...')
+
+    # Use the input data loaded for this run, or load it if the script is run on its own
+    if inputs is None:
+        inputs = AggregationInputs(marESA_file, bioregions_ext)
+
+    bioreg_maresa_merge, bioreg_version, maresa_version = prepare_offshore_data(marESA_file, bioregions_ext, inputs)
+    hierarchy = inputs.eunis_hierarchy()
+
+    filenames = {}
+    for assessment in assessments:
+        settings = OFFSHORE_ASSESSMENTS[assessment]
+        assessment_start = time.time()
+
+        # Aggregate the assessments from EUNIS Level 6 to EUNIS Level 2 (split by pressure across the worker processes
+        # where more than one process is used), then pivot the results of every level into the MasterFrame one part
+        # at a time (one part per partition for the 'parquet-partitioned' output)
+        bioreg_maresa_merge[assessment] = clean_assessment(bioreg_maresa_merge, assessment)
+        if processes == 1:
+            results = roll_up(bioreg_maresa_merge, assessment, settings['categories'], hierarchy)
+        else:
+            results = roll_up_partitioned(bioreg_maresa_merge, assessment, settings['categories'], hierarchy, split_by,
+                                          processes)
+        chunks = masterframe_chunks(results, assessment, partition if output_format == 'parquet-partitioned' else None)
+        if settings['fixups']:
+            chunks = (masterframe_fixups(MasterFrame, assessment) for MasterFrame in chunks)
+
+        # Export MasterFrame in the chosen output format (CSV by default) - Offshore Only
+
+        # Define folder file path to be saved into
+        outpath = "./MarESA/Output/" + output_file
+        # Define file name to save, categorised by date
+        date = time.strftime("%Y%m%d")
+        filename = settings['prefix'] + (date + "_" + str(bioreg_version) + '_' + str(maresa_version) + ".csv")
+        # Write each part of the output as it is pivoted, replacing the file extension where the output format is not
+        # CSV, and record the output within the run manifest of the output folder
+        run = run_record(settings['prefix'].rstrip('_'), {'bioregions': bioreg_version, 'maresa': maresa_version},
+                         [inputs.data_path + marESA_file, inputs.data_path + bioregions_ext,
+                          inputs.data_path + inputs.cor_table], assessment_start, date)
+        filename = write_chunks(chunks, outpath, filename, output_format, run)
+        filenames[assessment] = filename
+
+        # Stop the timer post computation and print the elapsed time
+        elapsed = (time.process_time() - start)
+
+        # Create print statement to indicate how long the process took and round value to 1 decimal place.
+        print('...The ' + str(filename) + ' script took ' +
+            str(round(elapsed / 60, 1)) + ' minutes to run and complete.' +
+            '\n' + 'This has been saved as a time-stamped output at ' +
+            'the following filepath: ' + str(outpath) + '\n\n')
+
+    return filenames
+
+
+if __name__ == "__main__":
+    os.chdir('C://Users//Ollie.Grint//Documents')
+    main('MarESA-Data-Extract-habitatspressures_2023-02-07.csv', 'BioregionsExtract_20220310.xlsx', 'Offshore rerun/')
@@ -1,57 +1,12 @@
 import pandas as pd
 from pathlib import Path
+from output_diff import diff_outputs
 
 
 
 def excel_diff(df_old, df_new):
-
-    dfDiff = df_new.copy()
-    droppedRows = []
-    newRows = []
-
-    cols_old = df_old.columns
-    cols_new = df_new.columns
-    sharedCols = list(set(cols_old).intersection(cols_new))
-
-    print('\n\nLooking for changes....\n')
-    with open('./Outputs/bioregions_comparison.txt', 'w') as f:
-        f.write('####### Changes #######\n\n')
-    for row in dfDiff.index:
-        if (row in df_old.index) and (row in df_new.index):
-            for col in sharedCols:
-                value_old = df_old.loc[row,col]
-                value_new = df_new.loc[row,col]
-                if value_old==value_new:
-                    dfDiff.loc[row,col] = df_new.loc[row,col]
-                else:
-                    dfDiff.loc[row,col] = ('{}->{}').format(value_old,value_new)
-                    print('Row - ', row, '\nChange - ', dfDiff.loc[row,col], '\n')
-                    with open('./Outputs/bioregions_comparison.txt', 'a') as f:
-                        f.write('Row - ' + row + '\n')
-                        f.write('Change - ' + dfDiff.loc[row,col] + '\n\n')
-
-        else:
-            newRows.append(row)
-
-    for row in df_old.index:
-        if row not in df_new.index:
-            droppedRows.append(row)
-            dfDiff = dfDiff.append(df_old.loc[row,:])
-
-    dfDiff = dfDiff.sort_index().fillna('')
-    print('\nLooking for new or deleted rows....\n')
-    print('\n' + str(len(newRows)) + f' New Rows: {newRows}')
-    print('\n' + str(len(droppedRows)) + f' Dropped Rows: {droppedRows}')
-
-    with open('./Outputs/bioregions_comparison.txt', 'a') as f:
-        f.write('\n####### New and deleted lines #######\n')
-        f.write('\n' + str(len(newRows)) + ' New Rows:\n\n')
-        for item in newRows:
-            f.write(f"{item}\n")
-        f.write('\n' + str(len(droppedRows)) + ' Dropped Rows:\n\n')
-        for item in droppedRows:
-            f.write(f"{item}\n")
-    print('\nDone.\n')
+    # Align the outputs on their row IDs and compare every column at once (see output_diff.py)
+    return diff_outputs(df_old, df_new, './Outputs/bioregions_comparison.txt', value_sets=False)
 
 
 def main():
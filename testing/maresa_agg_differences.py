@@ -1,68 +1,18 @@
-import pandas as pd
+import os
+import sys
 from pathlib import Path
 
+# Add the shared aggregation engine to the path to read the aggregation outputs (CSV or Parquet)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MarESA', 'Scripts',
+                             'AggregationEngine'))
+from AggregationOutput import read_output
+from output_diff import diff_outputs
 
 
-def excel_diff(df_old, df_new):
 
-    dfDiff = df_new.copy()
-    droppedRows = []
-    newRows = []
-
-    cols_old = df_old.columns
-    cols_new = df_new.columns
-    sharedCols = list(set(cols_old).intersection(cols_new))
-
-    print('\n\nLooking for changes....\n')
-    with open('./Output/maresa_agg_sens_comparison.txt', 'w') as f:
-        f.write('####### Changes #######\n\n')
-    for row in dfDiff.index:
-        if (row in df_old.index) and (row in df_new.index):
-            for col in sharedCols:
-                value_old = df_old.loc[row,col]
-                value_new = df_new.loc[row,col]
-                if value_old==value_new:
-                    dfDiff.loc[row,col] = df_new.loc[row,col]
-                else:
-
-                    #if ',' in value_old & value_new:
-
-                        #test_old = value_old.replace(" ", "")
-                        #test_new = value_new.replace(" ", "")
-                    test_old = str(value_old).split(', ')
-                    test_new = str(value_new).split(', ')
-                    if set(test_old) == set(test_new):
-                        dfDiff.loc[row,col] = df_new.loc[row,col]
-                    else:
-                        dfDiff.loc[row,col] = ('{}->{}').format(value_old,value_new)
-                        print('Row - ', row, '\nChange - ', dfDiff.loc[row,col], '\n')
-                        with open('./Output/maresa_agg_sens_comparison.txt', 'a') as f:
-                            f.write('Row - ' + row + '\n')
-                            f.write('Col - ' + col + '\n')
-                            f.write('Change - ' + dfDiff.loc[row,col] + '\n\n')
-        else:
-            newRows.append(row)
-
-    for row in df_old.index:
-        if row not in df_new.index:
-            droppedRows.append(row)
-            dfDiff = dfDiff.append(df_old.loc[row,:])
-
-    dfDiff = dfDiff.sort_index().fillna('')
-    print('\nLooking for new or deleted rows....\n')
-    print('\n' + str(len(newRows)) + f' New Rows: {newRows}')
-    print('\n' + str(len(droppedRows)) + f' Dropped Rows: {droppedRows}')
-
-    with open('./Output/maresa_agg_sens_comparison.txt', 'a') as f:
-        f.write('\n####### New and deleted lines #######\n')
-        f.write('\n' + str(len(newRows)) + ' New Rows:\n\n')
-        for item in newRows:
-            f.write(f"{item}\n")
-        f.write('\n' + str(len(droppedRows)) + ' Dropped Rows:\n\n')
-        for item in droppedRows:
-            f.write(f"{item}\n")
-
-    print('\nDone.\n')
+def excel_diff(df_old, df_new):
+    # Align the outputs on their row IDs and compare every column at once (see output_diff.py)
+    return diff_outputs(df_old, df_new, './Output/maresa_agg_sens_comparison.txt')
 
 
 def main():
@@ -71,8 +21,8 @@ def main():
     path_NEW = Path('./Data/OffshoreSensAgg_20210826_Bioreg20210802_marESA20210702.csv')
 
 
-    df_old = pd.read_csv(path_OLD).fillna('')
-    df_new = pd.read_csv(path_NEW).fillna('')
+    df_old = read_output(path_OLD).fillna('')
+    df_new = read_output(path_NEW).fillna('')
 
     #df_old = df_old.sort_values(['HabitatCode', 'SubregionName'])
     #df_new = df_new.sort_values(['HabitatCode', 'SubregionName'])
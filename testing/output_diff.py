@@ -0,0 +1,185 @@
+"""
+Shared diff of two versions of an output (e.g. two offshore sensitivity aggregation runs, or two bioregions extracts).
+
+The old and new tables are aligned on their index (the composite row ID) with one indexed join and every shared column
+is compared at once, so only the changed cells are visited in Python. The report is built in memory and written in one
+pass.
+
+Alongside the text report, the diff writes a change table with one row per change (row ID, pressure, subregion,
+level, column, old value, new value and change type) and a summary of the number of changes of each type by column,
+pressure, level and subregion. Both are CSV files next to the report, so follow-up questions (e.g. which L5 counts
+changed under Abrasion) can be answered by filtering the table rather than re-running the diff:
+
+    changes = pd.read_csv('./Output/maresa_agg_sens_comparison_changes.csv')
+    changes[(changes['Pressure'] == 'Abrasion') & (changes['Level'] == 5)]
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Types of change - a cell change is 'Added' where the old value is empty, 'Removed' where the new value is empty and
+# 'Changed' otherwise. Rows only within the new or old output are 'New row' or 'Dropped row'
+CELL_CHANGES = ['Changed', 'Added', 'Removed']
+ROW_CHANGES = ['New row', 'Dropped row']
+CHANGE_TYPES = CELL_CHANGES + ROW_CHANGES
+
+# Columns of the outputs which identify the pressure and subregion of each change
+GROUP_COLUMNS = ['Pressure', 'SubregionName']
+
+# Columns the changes are summarised by (where present)
+SUMMARY_COLUMNS = ['Column', 'Pressure', 'Level', 'SubregionName']
+
+
+def value_set(value):
+    """Return the set of the comma separated values within a value, e.g. 'High, Low' -> {'High', 'Low'}"""
+    return frozenset(str(value).split(', '))
+
+
+def is_empty(values):
+    """Return a boolean array which is True for each missing or empty string value"""
+    values = np.asarray(values, dtype=object)
+    return pd.isna(values) | (values == '')
+
+
+def changed_cells(old, new, value_sets=True):
+    """Return a boolean array which is True for each cell whose old and new values differ. Missing values are equal to
+    each other. If value_sets is True, values holding the same set of comma separated values (e.g. 'High, Low' and
+    'Low, High') are also equal"""
+    old_values = old.astype(object).values
+    new_values = new.astype(object).values
+    changed = ~((old_values == new_values) | (pd.isna(old_values) & pd.isna(new_values)))
+    if value_sets and changed.any():
+        rows, cols = np.nonzero(changed)
+        # Build the value sets once for each distinct value of the changed cells
+        sets = {value: value_set(value) for value in set(old_values[rows, cols]) | set(new_values[rows, cols])}
+        same = [sets[a] == sets[b] for a, b in zip(old_values[rows, cols], new_values[rows, cols])]
+        changed[rows[same], cols[same]] = False
+    return changed
+
+
+def column_levels(columns):
+    """Return the EUNIS level of each column name (e.g. 5 for 'Level_5' or 'L5_AssessedCount'), missing for columns
+    which do not belong to a level"""
+    return pd.Series(columns, dtype=object).str.extract(r'^L(?:evel_)?(\d+)', expand=False).astype(float).values
+
+
+def row_levels(df):
+    """Return the deepest EUNIS level given within each row of an output (missing where there are no Level_n
+    columns)"""
+    levels = np.full(len(df), np.nan)
+    for column in sorted((col for col in df.columns if str(col).startswith('Level_')),
+                         key=lambda col: column_levels([col])[0]):
+        levels = np.where(is_empty(df[column].values), levels, column_levels([column])[0])
+    return levels
+
+
+def row_changes(df, rows, change_type):
+    """Return the change table entries of the rows of an output which are new or have been dropped"""
+    changes = pd.DataFrame({'ID': rows}, dtype=object)
+    for column in GROUP_COLUMNS:
+        if column in df.columns:
+            changes[column] = df.loc[rows, column].values
+    changes['Level'] = row_levels(df.loc[rows])
+    changes['ChangeType'] = change_type
+    return changes
+
+
+def change_table(df_old, df_new, value_sets=True):
+    """Compare two versions of an output indexed by the same row ID and return a table of the changes - one entry for
+    each changed cell (in row and column order of the new output), then each new row and each dropped row. The
+    pressure and subregion are those of the new output (the old output for dropped rows). The level is that of the
+    changed column, or the deepest level of the row where the column (or row) has no level.
+
+    e.g. changes = change_table(df_old, df_new)"""
+    for name, df in [('old', df_old), ('new', df_new)]:
+        if df.index.has_duplicates:
+            raise ValueError('The ' + name + ' output holds duplicate row IDs: ' +
+                             ', '.join(map(str, df.index[df.index.duplicated()].unique()[:10])))
+
+    sharedCols = [col for col in df_new.columns if col in df_old.columns]
+    sharedRows = df_new.index[df_new.index.isin(df_old.index)]
+    newRows = df_new.index[~df_new.index.isin(df_old.index)]
+    droppedRows = df_old.index[~df_old.index.isin(df_new.index)]
+
+    # Align the old output to the rows and columns of the new output shared by both
+    old = df_old.reindex(index=sharedRows, columns=sharedCols)
+    new = df_new.reindex(index=sharedRows, columns=sharedCols)
+    rows, cols = np.nonzero(changed_cells(old, new, value_sets))
+    old_values = old.astype(object).values[rows, cols]
+    new_values = new.astype(object).values[rows, cols]
+
+    columns = np.array(sharedCols, dtype=object)[cols]
+    cells = row_changes(df_new, sharedRows[rows], 'Changed')
+    cells['Level'] = np.where(np.isnan(column_levels(columns)), cells['Level'], column_levels(columns))
+    cells['Column'] = columns
+    cells['Old'] = old_values
+    cells['New'] = new_values
+    cells['ChangeType'] = np.select([is_empty(old_values), is_empty(new_values)], ['Added', 'Removed'], 'Changed')
+
+    changes = pd.concat([cells, row_changes(df_new, newRows, 'New row'),
+                         row_changes(df_old, droppedRows, 'Dropped row')], ignore_index=True)
+    changes['Level'] = changes['Level'].astype('Int64')
+    order = ['ID'] + [col for col in GROUP_COLUMNS if col in changes.columns] + ['Level', 'Column', 'Old', 'New',
+                                                                                 'ChangeType']
+    return changes.reindex(columns=order)
+
+
+def summarise_changes(changes, by=SUMMARY_COLUMNS):
+    """Return the number of changes of each type (and in total) for each value of the summary columns, e.g. the
+    changes within each column, pressure, level and subregion. Row changes are not counted within the column summary"""
+    summaries = [pd.DataFrame(columns=['Summary', 'Value'] + CHANGE_TYPES + ['Total'])]
+    for column in by:
+        if column in changes.columns and changes[column].notna().any():
+            counts = changes.groupby([column, 'ChangeType']).size().unstack(fill_value=0)
+            counts = counts.reindex(columns=CHANGE_TYPES, fill_value=0)
+            counts['Total'] = counts.sum(axis=1)
+            summary = pd.DataFrame({'Summary': column, 'Value': counts.index})
+            summaries.append(summary.join(counts.reset_index(drop=True)))
+    return pd.concat(summaries, ignore_index=True)
+
+
+def diff_outputs(df_old, df_new, report, value_sets=True):
+    """Compare two versions of an output indexed by the same row ID and write the changed cells, new rows and dropped
+    rows to the report file. The change table and the change summary are written next to the report ('_changes.csv'
+    and '_summary.csv'). Returns the new output with each changed cell replaced by 'old->new' and the dropped rows
+    added back in, sorted by row ID.
+
+    e.g. diff_outputs(df_old, df_new, './Output/maresa_agg_sens_comparison.txt')"""
+    print('\n\nLooking for changes....\n')
+    changes = change_table(df_old, df_new, value_sets)
+    cells = changes[changes['ChangeType'].isin(CELL_CHANGES)]
+    newRows = list(changes.loc[changes['ChangeType'] == 'New row', 'ID'])
+    droppedRows = list(changes.loc[changes['ChangeType'] == 'Dropped row', 'ID'])
+    cell_changes = ['{}->{}'.format(value_old, value_new) for value_old, value_new in zip(cells['Old'], cells['New'])]
+    print(str(len(cells)) + ' Changes in ' + str(cells['ID'].nunique()) + ' Rows\n')
+
+    diff_values = df_new.astype(object).values.copy()
+    diff_values[df_new.index.get_indexer(cells['ID']), df_new.columns.get_indexer(cells['Column'])] = cell_changes
+    dfDiff = pd.DataFrame(diff_values, index=df_new.index, columns=df_new.columns)
+    dfDiff = pd.concat([dfDiff, df_old.loc[droppedRows]]).sort_index().fillna('')
+
+    print('\nLooking for new or deleted rows....\n')
+    print('\n' + str(len(newRows)) + f' New Rows: {newRows}')
+    print('\n' + str(len(droppedRows)) + f' Dropped Rows: {droppedRows}')
+
+    lines = ['####### Changes #######\n\n']
+    lines += ['Row - ' + str(row) + '\n' + 'Col - ' + str(col) + '\n' + 'Change - ' + change + '\n\n'
+              for row, col, change in zip(cells['ID'], cells['Column'], cell_changes)]
+    lines.append('\n####### New and deleted lines #######\n')
+    lines.append('\n' + str(len(newRows)) + ' New Rows:\n\n')
+    lines += [f"{item}\n" for item in newRows]
+    lines.append('\n' + str(len(droppedRows)) + ' Dropped Rows:\n\n')
+    lines += [f"{item}\n" for item in droppedRows]
+    with open(report, 'w') as f:
+        f.write(''.join(lines))
+
+    # Write the change table and the summary of the changes, to be filtered without re-running the diff
+    summary = summarise_changes(changes)
+    changes.to_csv(os.path.splitext(report)[0] + '_changes.csv', index=False)
+    summary.to_csv(os.path.splitext(report)[0] + '_summary.csv', index=False)
+    print(summary[summary['Summary'] != 'Column'].to_string(index=False))
+
+    print('\nDone.\n')
+    return dfDiff
@@ -0,0 +1,59 @@
+"""
+Reuse of aggregation outputs through the manifest of AggregationManifest.py - a task whose inputs and arguments are
+unchanged reuses its previous outputs, including when only the number of worker processes has changed.
+
+Run with: python -m unittest discover testing
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the shared aggregation engine and the offshore aggregation to the path
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MarESA', 'Scripts')
+sys.path.append(os.path.join(SCRIPTS, 'AggregationEngine'))
+sys.path.append(os.path.join(SCRIPTS, 'BSH_Agg_OffshoreSensitivity'))
+from AggregationManifest import record_outputs, reuse_outputs, task_key
+
+
+class TestManifestReuse(unittest.TestCase):
+
+    def setUp(self):
+        # The manifest paths are relative to the working directory, as in AggregationExecution.py
+        self.cwd = os.getcwd()
+        self.folder = tempfile.TemporaryDirectory()
+        os.chdir(self.folder.name)
+        os.makedirs('./MarESA/Data/')
+        os.makedirs('./MarESA/Output/run/')
+        with open('./MarESA/Data/MarESA-Data-Extract.csv', 'w') as f:
+            f.write('EUNIS_code,Pressure\nA5.27,Abrasion\n')
+        with open('./MarESA/Output/run/OffshoreSensAgg_20240206.csv', 'w') as f:
+            f.write(',Pressure\n0,Abrasion\n')
+        self.task = {'name': 'SAO', 'module': 'OffshoreAggregation', 'data': ['MarESA-Data-Extract.csv'],
+                     'output': 'run/'}
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def key(self, **kwargs):
+        return task_key(self.task, ['MarESA-Data-Extract.csv', 'run/'], dict({'output_format': 'csv'}, **kwargs), {})
+
+    def test_processes_not_in_key(self):
+        self.assertEqual(self.key(processes=2), self.key(processes=3))
+        self.assertEqual(self.key(processes=2), self.key())
+
+    def test_output_arguments_in_key(self):
+        self.assertNotEqual(self.key(processes=2), self.key(processes=2, output_format='parquet'))
+
+    def test_reuse_after_process_change(self):
+        manifest = {}
+        record_outputs(manifest, self.key(processes=2), self.task, 'OffshoreSensAgg_20240206.csv')
+        found, result = reuse_outputs(manifest, self.key(processes=3), self.task)
+        self.assertTrue(found)
+        self.assertEqual(result, 'OffshoreSensAgg_20240206.csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
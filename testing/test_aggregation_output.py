@@ -0,0 +1,77 @@
+"""
+Round trip of an aggregation output through every output format of AggregationOutput.py - each format must read back
+as the same frame as the csv output, so that the QA and testing scripts give the same results for any format. The
+'csv.zst' format is only checked where the zstandard library is installed.
+
+Run with: python -m unittest discover testing
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add the shared aggregation engine to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MarESA', 'Scripts',
+                             'AggregationEngine'))
+from AggregationOutput import read_output, write_chunks
+
+
+def aggregation_frame():
+    """Return a small offshore MasterFrame, with the missing values written by the aggregations - empty count strings,
+    'nan' text from columns cast to text, None and NaN"""
+    return pd.DataFrame({
+        'Pressure': ['Abrasion', 'Abrasion', 'Abrasion', 'Smothering', 'Smothering', 'Smothering'],
+        'SubregionName': ['Region 1', 'Region 1', 'Region 2', 'Region 1', 'Region 2', 'Region 2'],
+        'Level_2': ['A5', 'A5', 'A5', 'A5', 'A5', 'A4'],
+        'Level_5': ['A5.27', 'A5.27', 'nan', 'A5.27', None, 'A4.13'],
+        'Annex I sub-type': ['Reefs', 'nan', 'nan', 'Reefs', 'nan', 'nan'],
+        'L5_FinalResistance': ['Medium', 'Low', np.nan, 'High', 'Not Applicable', 'Medium'],
+        'L5_AssessedCount': ['H(3), M(2)', '', '', 'L(1)', 'Not Applicable', 'M(1)'],
+        'L5_UnassessedCount': ['', '', 'UN(2)', '', '', 'NE(1)'],
+        'L5_AggregationConfidenceValue': [2.0, 1.5, np.nan, 3.0, np.nan, 1.0],
+        'L5_AggregationConfidenceScore': [1, 2, 3, 1, 2, 3],
+        'Missing': [None, np.nan, '', 'nan', None, ''],
+    }, index=[0, 1, 2, 3, 4, 5])
+
+
+class TestOutputFormats(unittest.TestCase):
+
+    def round_trip(self, df, dtype=None):
+        """Write the frame in every available format and return the frame read back from each"""
+        formats = ['csv', 'csv.gz', 'parquet', 'parquet-partitioned']
+        if importlib.util.find_spec('zstandard') is not None:
+            formats.append('csv.zst')
+        frames = {}
+        with tempfile.TemporaryDirectory() as outpath:
+            for output_format in formats:
+                # Write the output in two parts, as the offshore aggregation does for each pressure
+                chunks = [df[df['Pressure'] == pressure] for pressure in df['Pressure'].unique()]
+                filename = write_chunks(chunks, outpath + os.sep, 'Output.csv', output_format)
+                frames[output_format] = read_output(os.path.join(outpath, filename), dtype=dtype)
+        return frames
+
+    def test_formats_read_as_csv(self):
+        frames = self.round_trip(aggregation_frame())
+        for output_format, df in frames.items():
+            with self.subTest(output_format=output_format):
+                pd.testing.assert_frame_equal(df, frames['csv'])
+
+    def test_formats_read_as_csv_text(self):
+        frames = self.round_trip(aggregation_frame(), dtype=str)
+        for output_format, df in frames.items():
+            with self.subTest(output_format=output_format):
+                pd.testing.assert_frame_equal(df, frames['csv'])
+
+    def test_missing_values(self):
+        df = self.round_trip(aggregation_frame())['parquet']
+        self.assertEqual(df['L5_AssessedCount'].isna().tolist(), [False, True, True, False, False, False])
+        self.assertEqual(df['Annex I sub-type'].isna().sum(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()